@@ -1,6 +1,12 @@
 # main.py
 # C01-P01
 
+import heapq
+import os
+import sys
+import tempfile
+import time
+
 print('Hello Mars')
 
 
@@ -8,58 +14,287 @@ filename = r'D:\SW CAMP with Codyssey\C01\P01\mission_computer_main.log'
 output = 'log_analysis.md'
 problem_output = 'problem_logs.md'
 
-try:
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        print(lines)
+# 문제 로그 키워드
+keywords = ['explosion', 'unstable']
 
-    # oxygen 포함 로그만 필터링
-    accident_logs = [line.strip() for line in lines if 'oxygen' in line.lower()]
+# 스트리밍 모드에서 한 번에 메모리에 올리는 최대 줄 수
+SORT_CHUNK_SIZE = 100000
 
-    # 시간 문자열 기준으로 역순 정렬 (문자열 정렬로 처리)
-    accident_logs.sort(
-        key=lambda log: log.split(',')[0],  # 시간 부분만 비교
-        reverse=True
-    )
+# follow 모드에서 새 줄을 확인하는 주기 (초)
+FOLLOW_INTERVAL = 0.5
+
+# follow 모드에서 보고서 끝에 붙이는 실시간 구간 제목
+LIVE_SECTION = '\n## 실시간 추가 로그 (도착 순)\n\n'
 
-    # 문제 로그: explosion 또는 unstable 포함
-    keywords = ['explosion', 'unstable']
-    problem_logs = [
-        log for log in accident_logs if any(k in log.lower() for k in keywords)
-    ]
+
+def log_time(log):
+    return log.split(',')[0]  # 시간 부분만 비교
+
+
+def is_problem(log):
+    lower = log.lower()
+    return any(k in lower for k in keywords)
+
+
+# ----------------------------------------
+# 📝 보고서 작성 (배치/스트리밍 공용)
+# ----------------------------------------
+
+def write_reports(problem_asc, accident_desc, problem_desc):
+    # 세 인자 모두 이터러블이면 충분 (리스트 또는 제너레이터)
 
     # 사고 보고서 작성 (log_analysis.md)
     with open(output, 'w', encoding='utf-8') as f:
         f.write('# 사고 로그 보고서\n\n')
         f.write('##  사고 원인 분석\n')
-        if problem_logs:
+        problem_asc = iter(problem_asc)
+        first = next(problem_asc, None)
+        if first is not None:
             f.write('- 로그에 따르면, 산소 탱크의 이상 상태 후 폭발이 발생함.\n')
             f.write('- 시간 흐름상 다음의 문제가 나타남:\n')
-            for log in sorted(problem_logs, key=lambda l: l.split(',')[0]):  # 시간순 정렬
+            f.write(f'  - {first}\n')
+            for log in problem_asc:  # 시간순 정렬
                 f.write(f'  - {log}\n')
         else:
             f.write('- 심각한 문제 로그는 발견되지 않았습니다.\n')
 
         f.write('\n## 사고 관련 로그 (시간 역순)\n\n')
-        if accident_logs:
-            for log in accident_logs:
-                f.write(f'- {log}\n')
-        else:
+        found = False
+        for log in accident_desc:
+            f.write(f'- {log}\n')
+            found = True
+        if not found:
             f.write('사고 관련 로그가 없습니다.\n')
 
     # 문제 로그 파일 작성 (problem_logs.md)
     with open(problem_output, 'w', encoding='utf-8') as f:
         f.write('#  문제 로그 모음\n\n')
-        if problem_logs:
-            for log in problem_logs:
-                f.write(f'- {log}\n')
-        else:
+        found = False
+        for log in problem_desc:
+            f.write(f'- {log}\n')
+            found = True
+        if not found:
             f.write('문제 로그가 없습니다.\n')
 
     print(f' 사고 보고서 생성 완료: {output}')
     print(f' 문제 로그 저장 완료: {problem_output}')
 
-except FileNotFoundError:
-    print(' 로그 파일을 찾을 수 없습니다.')
-except Exception as e:
-    print(' 오류 발생:', e)
+
+# ----------------------------------------
+# 📦 배치 모드 (기존 방식: 전체 로그를 메모리에 올림)
+# ----------------------------------------
+
+def run_batch(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+        print(lines)
+
+    # oxygen 포함 로그만 필터링
+    accident_logs = [line.strip() for line in lines if 'oxygen' in line.lower()]
+
+    # 시간 문자열 기준으로 역순 정렬 (문자열 정렬로 처리)
+    accident_logs.sort(key=log_time, reverse=True)
+
+    # 문제 로그: explosion 또는 unstable 포함
+    problem_logs = [log for log in accident_logs if is_problem(log)]
+
+    write_reports(sorted(problem_logs, key=log_time), accident_logs, problem_logs)
+
+
+# ----------------------------------------
+# 🌊 스트리밍 모드 (메모리 사용량 일정)
+# ----------------------------------------
+
+def iter_log_lines(path, end=None):
+    # 한 줄씩 읽어서 돌려주는 제너레이터
+    # end 가 주어지면 그 바이트 위치까지만 읽음 (follow 모드의 시작 보고서용)
+    if end is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        return
+
+    with open(path, 'rb') as f:
+        pos = 0
+        for raw in f:
+            pos += len(raw)
+            if pos > end:
+                break
+            line = raw.decode('utf-8', errors='replace').strip()
+            if line:
+                yield line
+
+
+class ExternalSorter:
+    # 최대 chunk_size 줄만 메모리에 두고, 넘치면 정렬된 run 파일로 내려쓴 뒤
+    # heapq.merge 로 합쳐서 정렬 결과를 돌려주는 외부 병합 정렬
+    def __init__(self, key, reverse=False, chunk_size=SORT_CHUNK_SIZE):
+        self.key = key
+        self.reverse = reverse
+        self.chunk_size = chunk_size
+        self.buffer = []
+        self.runs = []
+
+    def add(self, line):
+        self.buffer.append(line)
+        if len(self.buffer) >= self.chunk_size:
+            self._spill()
+
+    def _spill(self):
+        self.buffer.sort(key=self.key, reverse=self.reverse)
+        run = tempfile.TemporaryFile('w+', encoding='utf-8')
+        for line in self.buffer:
+            run.write(line + '\n')
+        run.seek(0)
+        self.runs.append(run)
+        self.buffer = []
+
+    def _read_run(self, run):
+        for line in run:
+            yield line.rstrip('\n')
+
+    def sorted(self):
+        self.buffer.sort(key=self.key, reverse=self.reverse)
+        sources = [self._read_run(run) for run in self.runs]
+        sources.append(iter(self.buffer))
+        return heapq.merge(*sources, key=self.key, reverse=self.reverse)
+
+    def close(self):
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.buffer = []
+
+
+def run_stream(path, chunk_size=SORT_CHUNK_SIZE, end=None):
+    accident_sorter = ExternalSorter(log_time, reverse=True, chunk_size=chunk_size)
+    problem_asc_sorter = ExternalSorter(log_time, chunk_size=chunk_size)
+    problem_desc_sorter = ExternalSorter(log_time, reverse=True, chunk_size=chunk_size)
+    sorters = [accident_sorter, problem_asc_sorter, problem_desc_sorter]
+
+    try:
+        # 한 번의 순회로 oxygen 로그와 문제 로그를 함께 분류
+        for line in iter_log_lines(path, end):
+            if 'oxygen' not in line.lower():
+                continue
+            accident_sorter.add(line)
+            if is_problem(line):
+                problem_asc_sorter.add(line)
+                problem_desc_sorter.add(line)
+
+        write_reports(
+            problem_asc_sorter.sorted(),
+            accident_sorter.sorted(),
+            problem_desc_sorter.sorted()
+        )
+    finally:
+        for sorter in sorters:
+            sorter.close()
+
+
+# ----------------------------------------
+# 👀 follow 모드 (tail -f 처럼 새로 추가된 줄만 처리)
+# ----------------------------------------
+
+# 보고서의 로그 목록은 최신 로그가 맨 위(시간 역순)라서, 새 로그를 그 자리에 넣으려면
+# 파일 전체를 다시 써야 한다. 그래서 시작할 때 그때까지의 로그로 스트리밍 모드와 같은
+# 보고서를 만들고(외부 정렬, 메모리 일정), 이후 들어오는 로그는 각 보고서 끝의
+# 실시간 구간에 도착 순으로 이어 쓴다. 갱신 비용은 새 줄 수에만 비례하고
+# 메모리에는 새 줄 묶음만 둔다. 로그가 잘리거나 교체되면 보고서를 다시 만든다.
+
+def complete_lines_end(path):
+    # 마지막 줄바꿈 바로 뒤 위치 (아직 쓰는 중인 마지막 줄은 제외)
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            step = min(pos, 65536)
+            f.seek(pos - step)
+            i = f.read(step).rfind(b'\n')
+            if i >= 0:
+                return pos - step + i + 1
+            pos -= step
+    return 0
+
+
+def follow_lines(path, offset=0, interval=FOLLOW_INTERVAL, max_batch=SORT_CHUNK_SIZE):
+    # offset 이후 파일 끝에 추가되는 줄을 묶음(list, 최대 max_batch 줄) 단위로 돌려주는 제너레이터
+    # 로그가 잘렸거나 새로 만들어지면 끝남 (호출한 쪽에서 보고서를 다시 만듦)
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        partial = b''
+        while True:
+            batch = []
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    # 아직 쓰는 중인 줄은 다음 확인 때까지 보관
+                    partial += raw
+                    break
+                line = (partial + raw).decode('utf-8', errors='replace').strip()
+                partial = b''
+                if line:
+                    batch.append(line)
+                    if len(batch) >= max_batch:
+                        break
+            if batch:
+                yield batch
+                continue
+
+            time.sleep(interval)
+            if os.path.getsize(path) < f.tell():
+                return
+
+
+def start_live_sections():
+    for path in (output, problem_output):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(LIVE_SECTION)
+
+
+def append_live(accident_logs, problem_logs):
+    # 새 로그만 보고서 끝에 이어 씀
+    for path, logs in ((output, accident_logs), (problem_output, problem_logs)):
+        if logs:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(f'- {log}\n' for log in logs)
+
+
+def run_follow(path, interval=FOLLOW_INTERVAL):
+    print(' 로그 감시를 시작합니다. (종료: Ctrl+C)')
+    try:
+        while True:
+            # 지금까지의 로그로 보고서를 만들고, 그 뒤에 추가되는 줄만 처리
+            offset = complete_lines_end(path)
+            run_stream(path, end=offset)
+            start_live_sections()
+            for batch in follow_lines(path, offset, interval):
+                accident_logs = [line for line in batch if 'oxygen' in line.lower()]
+                problem_logs = [line for line in accident_logs if is_problem(line)]
+                for line in problem_logs:
+                    print(f' 🚨 문제 로그 감지: {line}')
+                append_live(accident_logs, problem_logs)
+            print(' 로그가 잘렸거나 교체되어 보고서를 다시 만듭니다.')
+    except KeyboardInterrupt:
+        print(' 로그 감시를 종료합니다.')
+
+
+if __name__ == '__main__':
+    # 사용법: python main.py [--stream | --follow] [로그 파일 경로]
+    args = sys.argv[1:]
+    stream = '--stream' in args
+    follow = '--follow' in args
+    paths = [a for a in args if not a.startswith('--')]
+    path = paths[0] if paths else filename
+
+    try:
+        if follow:
+            run_follow(path)
+        elif stream:
+            run_stream(path)
+        else:
+            run_batch(path)
+    except FileNotFoundError:
+        print(' 로그 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(' 오류 발생:', e)
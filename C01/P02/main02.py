@@ -1,5 +1,17 @@
 # main02.py
 
+import array
+import bisect
+import heapq
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import struct
+import sys
+
 file_path = r"D:\SW CAMP with Codyssey\C01\P02\mission_computer_main.log"
 
 def read_log_file(file_path):
@@ -22,6 +34,113 @@ def parse_lines_to_list(lines):
             log_list.append(parts)
     return log_list
 
+# ----------------------------------------
+# 🚀 멀티 프로세스 병렬 변환 (파싱 → 정렬 → JSON)
+# ----------------------------------------
+# 로그 파일을 줄 경계에 맞춘 바이트 구간으로 나누고, 각 구간을 프로세스 풀에서
+# 파싱·정렬한 뒤 JSON 레코드 바이트까지 만들어 돌려준다.
+# 파싱 결과(리스트)를 부모로 보내면 부모가 레코드마다 unpickle·정렬해야 해서
+# 직렬 파싱보다 느려지므로, 부모는 정렬된 바이트 덩어리를 순서대로 이어 쓰기만 한다.
+# 구간끼리 시간 범위가 겹칠 때만 (뒤늦게 기록된 로그 등) 겹친 구간들을 레코드 단위로 병합한다.
+
+def split_log_ranges(file_path, parts):
+    """파일을 줄 단위 경계에 맞춘 (시작, 끝) 바이트 구간 parts 개로 나눈다."""
+    size = os.path.getsize(file_path)
+    parts = max(1, min(parts, size))  # 파일보다 많은 구간으로 나누지 않음
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, parts):
+            pos = max(size * i // parts, bounds[-1])
+            if pos == 0:
+                continue
+            f.seek(pos - 1)
+            f.readline()  # 구간 시작을 다음 줄의 처음으로 맞춤
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def _render_log_range(args):
+    # 반환값: (레코드 수, 첫 키, 마지막 키, 키 목록(b"\n" 구분), 레코드 시작 위치, JSON 레코드 바이트)
+    file_path, start, end, reverse, fmt, compact = args
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).decode('utf-8', errors='replace').splitlines()
+    if start == 0 and lines:
+        lines = lines[1:]  # 첫 줄은 헤더이므로 제외
+    log_list = parse_lines_to_list(lines)
+    log_list.sort(key=lambda x: x[0], reverse=reverse)
+
+    quote, template, _, _, sep, _, _ = _json_layout(fmt, compact)
+    records = [(template % (quote(ts), quote(event), quote(message))).encode('utf-8')
+               for ts, event, message in log_list]
+    step = len(sep.encode('utf-8'))
+    starts = array.array('Q', [0])
+    starts.extend(itertools.accumulate(len(record) + step for record in records))
+    if not records:
+        return 0, None, None, b"", starts, b""
+    keys = "\n".join(log[0] for log in log_list).encode('utf-8')
+    return len(records), log_list[0][0], log_list[-1][0], keys, starts, sep.encode('utf-8').join(records)
+
+def _cluster_runs(runs, reverse):
+    # 출력 순서대로 구간을 늘어놓고, 키 범위가 겹치는 구간끼리 묶는다 (묶음 사이에는 겹침 없음)
+    # run: (파일 순서, 레코드 수, 첫 키, 마지막 키, ...)
+    if reverse:
+        ordered = sorted(runs, key=lambda run: run[2], reverse=True)
+    else:
+        ordered = sorted(runs, key=lambda run: run[2])
+    clusters = []
+    for run in ordered:
+        if clusters and (run[2] >= edge if reverse else run[2] <= edge):
+            clusters[-1].append(run)
+            edge = min(edge, run[3]) if reverse else max(edge, run[3])
+        else:
+            clusters.append([run])
+            edge = run[3]
+    return clusters
+
+def _merge_runs(cluster, reverse, sep):
+    # 겹치는 구간들을 키 순서로 병합 (같은 키는 파일 앞쪽 구간이 먼저 → 직렬 정렬과 같은 순서)
+    cluster = sorted(cluster)
+    streams = [zip(run[4].split(b"\n"), itertools.repeat(j), itertools.count())
+               for j, run in enumerate(cluster)]
+    step = len(sep)
+    pieces = []
+    for _, j, i in heapq.merge(*streams, key=lambda item: item[0], reverse=reverse):
+        starts, payload = cluster[j][5], cluster[j][6]
+        pieces.append(payload[starts[i]:starts[i + 1] - step])
+    return sep.join(pieces)
+
+def convert_log_to_json_parallel(log_path, json_path, workers=None, reverse=True,
+                                 fmt="json", compact=False, chunks_per_worker=4):
+    """로그 파일을 workers 개 프로세스로 나눠 파싱·정렬(기본: 시간 역순)하고 JSON 으로 저장한다.
+
+    결과는 read_log_file → parse_lines_to_list → sort_logs_desc → save_as_json 과 같다.
+    """
+    workers = workers or os.cpu_count() or 1
+    try:
+        ranges = split_log_ranges(log_path, workers * chunks_per_worker)
+        tasks = [(log_path, start, end, reverse, fmt, compact) for start, end in ranges]
+        if workers == 1:
+            results = [_render_log_range(task) for task in tasks]
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_render_log_range, tasks)
+        runs = [(index,) + result for index, result in enumerate(results) if result[0]]
+
+        _, _, head, prefix, sep, tail, empty_tail = _json_layout(fmt, compact)
+        sep = sep.encode('utf-8')
+        with open(json_path, 'wb') as f:
+            f.write(head)
+            for number, cluster in enumerate(_cluster_runs(runs, reverse)):
+                f.write(sep if number else prefix.encode('utf-8'))
+                f.write(cluster[0][6] if len(cluster) == 1 else _merge_runs(cluster, reverse, sep))
+            f.write(tail if runs else empty_tail)
+        print(f"✅ JSON 파일 저장 완료 → {json_path}")
+    except FileNotFoundError:
+        print("❌ 파일을 찾을 수 없습니다.")
+    except Exception as e:
+        print(f"❌ 병렬 변환 중 오류 발생: {e}")
+
 def print_log_list(log_list):
     print("▶ 리스트 객체:")
     for log in log_list:
@@ -40,16 +159,54 @@ def convert_list_to_dict(log_list):
         })
     return dict_list
 
-def save_as_json(dict_list, file_path):
+def _record_fields(item):
+    # 딕셔너리와 (timestamp, event, message) 튜플/리스트 모두 허용
+    if isinstance(item, dict):
+        return item["timestamp"], item["event"], item["message"]
+    return item[0], item[1], item[2]
+
+def _json_layout(fmt, compact):
+    # (이스케이프 함수, 레코드 템플릿, 시작, 첫 레코드 앞, 레코드 사이, 끝, 레코드가 없을 때 끝)
+    # 문자열 이스케이프는 json 모듈의 C 구현을 그대로 사용
+    if compact:
+        quote = json.encoder.encode_basestring_ascii
+        template = '{"timestamp":%s,"event":%s,"message":%s}'
+    else:
+        quote = json.encoder.encode_basestring
+        template = '{"timestamp": %s, "event": %s, "message": %s}'
+
+    if fmt == "jsonl":
+        return quote, template, b"", "", "\n", b"\n", b""
+    if compact:
+        return quote, template, b"[", "", ",", b"]", b"]"
+    return quote, template, b"[\n", "  ", ",\n  ", b"\n]", b"]"
+
+def save_as_json(records, file_path, fmt="json", compact=False,
+                 buffer_size=1024 * 1024, batch_size=10000):
+    """로그 레코드를 스트리밍 방식으로 JSON 파일에 저장한다.
+
+    records 는 이터레이터여도 되므로 전체 목록을 메모리에 올릴 필요가 없다.
+    fmt="json" 이면 기존과 같은 배열 형식, fmt="jsonl" 이면 한 줄에 하나씩(JSON Lines).
+    compact=True 이면 공백 없이 ASCII 전용(\\uXXXX 이스케이프)으로 인코딩한다.
+    """
+    quote, template, head, prefix, sep, tail, empty_tail = _json_layout(fmt, compact)
+
     try:
-        with open(file_path, 'w') as f:
-            f.write('[\n')
-            for i, item in enumerate(dict_list):
-                json_line = '  {' + f'"timestamp": "{item["timestamp"]}", "event": "{item["event"]}", "message": "{item["message"]}"' + '}'
-                if i < len(dict_list) - 1:
-                    json_line += ','
-                f.write(json_line + '\n')
-            f.write(']')
+        with open(file_path, 'wb', buffering=buffer_size) as f:
+            f.write(head)
+            count = 0
+            batch = []
+            for item in records:
+                timestamp, event, message = _record_fields(item)
+                batch.append(template % (quote(timestamp), quote(event), quote(message)))
+                if len(batch) >= batch_size:
+                    f.write(((sep if count else prefix) + sep.join(batch)).encode('utf-8'))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                f.write(((sep if count else prefix) + sep.join(batch)).encode('utf-8'))
+                count += len(batch)
+            f.write(tail if count else empty_tail)
         print(f"✅ JSON 파일 저장 완료 → {file_path}")
     except Exception as e:
         print(f"❌ JSON 저장 중 오류 발생: {e}")
@@ -58,53 +215,496 @@ def save_as_json(dict_list, file_path):
 # 🎁 보너스 과제: 특정 키워드 포함 로그 검색
 # ----------------------------------------
 
-def search_logs_by_keyword(file_path, keyword):
+def search_logs_by_keyword(log_path, keyword, mode="and"):
+    # 로그 파일의 키워드 역색인(update_keyword_index)으로 찾으므로 파일 전체를 읽지 않음
+    # keyword 에 단어가 여러 개면 mode("and" / "or")에 따라 모두 / 하나라도 포함된 로그를 찾음
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
+        logs = search_logs_by_keywords(log_path, keyword.split(), mode)
+
         print(f"\n🔍 '{keyword}'가 포함된 로그:")
-        found = False
-        for line in lines:
-            if keyword.lower() in line.lower():
-                print(line.strip())
-                found = True
-        if not found:
+        for log in logs:
+            print(log)
+        if not logs:
             print("해당 키워드가 포함된 로그를 찾을 수 없습니다.")
+        return logs
     except FileNotFoundError:
-        print("❌ JSON 파일을 찾을 수 없습니다.")
+        print("❌ 로그 파일을 찾을 수 없습니다.")
     except Exception as e:
         print(f"❌ 검색 중 오류 발생: {e}")
+    return []
+
+# ----------------------------------------
+# ⚡ 타임스탬프 인덱스 (시간 범위 / 최근 N개 조회)
+# ----------------------------------------
+# 로그 옆에 <로그 파일>.idx 파일을 두고 (타임스탬프, 바이트 오프셋)을
+# 타임스탬프 순으로 고정 길이 레코드로 저장한다.
+# 로그가 늘어나면 이미 인덱싱한 위치 이후의 줄만 추가로 읽는다.
+# 헤더의 레코드 수까지만 유효하므로, 레코드를 먼저 쓰고 헤더를 마지막에 바꾼다.
+# (중간에 멈춰도 이전 헤더가 가리키는 인덱스가 그대로 유효함)
+
+INDEX_MAGIC = b"TSI2"
+INDEX_HEADER = struct.Struct("<4sQQ")    # 매직, 인덱싱이 끝난 로그 크기(byte), 레코드 수
+INDEX_RECORD = struct.Struct("<19sQ")    # 타임스탬프(YYYY-MM-DD HH:MM:SS), 줄 시작 오프셋
+
+def index_path_for(log_path):
+    return log_path + ".idx"
+
+def _scan_log(log_path, start, handle):
+    # start 위치부터 한 줄씩 읽으며 handle(오프셋, [timestamp, event, message]) 호출
+    # 반환값: 다음 갱신을 시작할 오프셋
+    with open(log_path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # 줄바꿈 없이 끝난 마지막 줄은 아직 쓰는 중일 수 있으므로 다음 갱신에서 처리
+                break
+            line = raw.decode('utf-8', errors='replace').strip()
+            parts = line.split(',', 2)
+            if len(parts) == 3 and not (offset == 0 and parts[0] == "timestamp"):
+                handle(offset, parts)
+            offset += len(raw)
+    return offset
+
+def _scan_log_offsets(log_path, start):
+    # start 위치부터 (타임스탬프, 오프셋) 목록을 만든다
+    entries = []
+    end = _scan_log(
+        log_path, start,
+        lambda offset, parts: entries.append((parts[0].encode('ascii', errors='replace')[:19], offset))
+    )
+    return entries, end
+
+def _read_index(index_path):
+    with open(index_path, 'rb') as f:
+        indexed_size, count = _index_header(f)
+        data = f.read(count * INDEX_RECORD.size)
+    entries = [(ts.rstrip(b"\0"), offset) for ts, offset in INDEX_RECORD.iter_unpack(data)]
+    return entries, indexed_size
+
+def _write_index(index_path, entries, indexed_size):
+    # 임시 파일에 다 쓴 뒤 교체하므로, 중간에 실패해도 기존 인덱스가 남음
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, indexed_size, len(entries)))
+        f.write(b"".join(INDEX_RECORD.pack(ts, offset) for ts, offset in entries))
+    os.replace(tmp_path, index_path)
+
+def _read_index_header(index_path):
+    # (인덱싱이 끝난 로그 크기, 레코드 수, 마지막 타임스탬프)만 읽는다
+    with open(index_path, 'rb') as f:
+        indexed_size, count = _index_header(f)
+        last_ts = _index_record(f, count - 1)[0] if count else None
+    return indexed_size, count, last_ts
+
+def update_timestamp_index(log_path, index_path=None):
+    """인덱스를 처음 만들거나, 로그에 추가된 부분만 반영한다."""
+    index_path = index_path or index_path_for(log_path)
+    log_size = os.path.getsize(log_path)
+
+    indexed_size, count, last_ts = None, 0, None
+    if os.path.exists(index_path):
+        try:
+            indexed_size, count, last_ts = _read_index_header(index_path)
+        except (ValueError, struct.error):
+            indexed_size = None
+        if indexed_size is not None and indexed_size > log_size:
+            # 로그가 잘렸거나 교체됨 → 처음부터 다시 생성
+            indexed_size = None
+
+    if indexed_size is None:
+        entries, indexed_size = _scan_log_offsets(log_path, 0)
+        entries.sort()
+        _write_index(index_path, entries, indexed_size)
+        return index_path
+
+    if indexed_size == log_size:
+        return index_path
+
+    new_entries, indexed_size = _scan_log_offsets(log_path, indexed_size)
+    new_entries.sort()
+
+    if last_ts is None or not new_entries or last_ts <= new_entries[0][0]:
+        # 시간순으로 이어 붙는 일반적인 경우: 레코드를 뒤에 추가한 다음 헤더를 갱신
+        # (이전에 헤더 갱신 전에 멈춰 남은 레코드가 있으면 덮어씀)
+        with open(index_path, 'r+b') as f:
+            f.seek(INDEX_HEADER.size + count * INDEX_RECORD.size)
+            f.truncate()
+            f.write(b"".join(INDEX_RECORD.pack(ts, offset) for ts, offset in new_entries))
+            f.flush()
+            f.seek(0)
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, indexed_size, count + len(new_entries)))
+    else:
+        # 과거 시각의 로그가 뒤늦게 들어온 경우에만 전체 병합 후 다시 저장
+        old_entries, _ = _read_index(index_path)
+        _write_index(index_path, list(heapq.merge(old_entries, new_entries)), indexed_size)
+    return index_path
+
+def _index_header(f):
+    # (인덱싱이 끝난 로그 크기, 레코드 수)
+    f.seek(0)
+    magic, indexed_size, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+    if magic != INDEX_MAGIC:
+        raise ValueError("인덱스 파일 형식이 올바르지 않습니다.")
+    return indexed_size, count
+
+def _index_count(f):
+    return _index_header(f)[1]
+
+def _index_record(f, i):
+    f.seek(INDEX_HEADER.size + i * INDEX_RECORD.size)
+    ts, offset = INDEX_RECORD.unpack(f.read(INDEX_RECORD.size))
+    return ts.rstrip(b"\0"), offset
+
+def _index_lower_bound(f, count, ts):
+    # 인덱스 파일 위에서 바로 이진 탐색 (인덱스 전체를 읽지 않음)
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _index_record(f, mid)[0] < ts:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _read_log_at(log_file, offset):
+    log_file.seek(offset)
+    line = log_file.readline().decode('utf-8', errors='replace').strip()
+    return line.split(',', 2)
+
+def query_time_range(log_path, start, end):
+    """start <= timestamp <= end 인 로그를 시간순 리스트로 반환한다."""
+    index_path = update_timestamp_index(log_path)
+    result = []
+    with open(index_path, 'rb') as idx, open(log_path, 'rb') as log_file:
+        count = _index_count(idx)
+        i = _index_lower_bound(idx, count, start.encode('ascii'))
+        end = end.encode('ascii')
+        while i < count:
+            ts, offset = _index_record(idx, i)
+            if ts > end:
+                break
+            result.append(_read_log_at(log_file, offset))
+            i += 1
+    return result
+
+def query_last_events(log_path, n):
+    """가장 최근 n개의 로그를 시간 역순 리스트로 반환한다."""
+    index_path = update_timestamp_index(log_path)
+    result = []
+    with open(index_path, 'rb') as idx, open(log_path, 'rb') as log_file:
+        count = _index_count(idx)
+        for i in range(count - 1, max(count - n, 0) - 1, -1):
+            ts, offset = _index_record(idx, i)
+            result.append(_read_log_at(log_file, offset))
+    return result
+
+# ----------------------------------------
+# 🔎 키워드 역색인 (여러 키워드 AND / OR 검색)
+# ----------------------------------------
+# <로그 파일>.kwidx 에 토큰별 로그 줄 오프셋 목록(posting)을 세그먼트 단위로 저장한다.
+#   [헤더] 매직, 인덱싱이 끝난 로그 크기, 세그먼트 목록 위치
+#   [세그먼트] posting 배열들(uint64) | 토큰 바이트 | 토큰 표(토큰 순 정렬, 고정 길이)
+#   [세그먼트 목록] 세그먼트 수, (시작 위치, 토큰 표 위치, 토큰 수, posting 수) ...
+# 로그에 줄이 추가되면 새 줄의 posting 만 세그먼트로 파일 끝에 덧붙이고 목록과 헤더를 갱신한다.
+# 새 세그먼트보다 크게 작지 않은 최근 세그먼트들은 함께 합쳐(단계식 병합) 세그먼트 수를
+# O(log n) 으로 유지하고, 모든 세그먼트를 합치게 되거나 버려진 영역이 커지면 파일을 새로 쓴다.
+# 최신 여부는 헤더만 읽어 확인하고, 검색은 mmap 위에서 세그먼트별 토큰 표를 이진 탐색한다.
+
+KEYWORD_MAGIC = b"KWI2"
+KEYWORD_HEADER = struct.Struct("<4sQQ")   # 매직, 인덱싱이 끝난 로그 크기, 세그먼트 목록 위치
+KEYWORD_SEGMENT = struct.Struct("<QQQQ")  # 시작 위치, 토큰 표 위치, 토큰 수, posting 수
+KEYWORD_ENTRY = struct.Struct("<QIQQ")    # 토큰 위치, 토큰 길이, posting 위치, posting 개수
+KEYWORD_MERGE_RATIO = 2
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def keyword_index_path_for(log_path):
+    return log_path + ".kwidx"
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _read_keyword_header(f):
+    f.seek(0)
+    magic, indexed_size, directory_offset = KEYWORD_HEADER.unpack(f.read(KEYWORD_HEADER.size))
+    if magic != KEYWORD_MAGIC:
+        raise ValueError("키워드 인덱스 파일 형식이 올바르지 않습니다.")
+    return indexed_size, directory_offset
+
+class KeywordIndexReader:
+    """키워드 인덱스 파일을 mmap 으로 열어 필요한 토큰의 posting 만 읽는다."""
+
+    def __init__(self, index_path):
+        with open(index_path, 'rb') as f:
+            _, directory_offset = _read_keyword_header(f)
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (count,) = struct.unpack_from("<I", self.map, directory_offset)
+        self.segments = [
+            KEYWORD_SEGMENT.unpack_from(self.map, directory_offset + 4 + i * KEYWORD_SEGMENT.size)
+            for i in range(count)
+        ]
+
+    def _entry(self, segment, i):
+        return KEYWORD_ENTRY.unpack_from(self.map, segment[1] + i * KEYWORD_ENTRY.size)
+
+    def _key(self, entry):
+        return self.map[entry[0]:entry[0] + entry[1]]
+
+    def _postings(self, entry):
+        postings = array.array('Q')
+        postings.frombytes(self.map[entry[2]:entry[2] + entry[3] * postings.itemsize])
+        return postings
+
+    def postings(self, token):
+        # 세그먼트는 로그 순서대로 추가되므로 이어 붙이면 정렬된 posting 이 됨
+        key = token.encode('utf-8')
+        result = array.array('Q')
+        for segment in self.segments:
+            lo, hi = 0, segment[2]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._key(self._entry(segment, mid)) < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < segment[2]:
+                entry = self._entry(segment, lo)
+                if self._key(entry) == key:
+                    result.extend(self._postings(entry))
+        return result
+
+    def segment_postings(self, segment):
+        for i in range(segment[2]):
+            entry = self._entry(segment, i)
+            yield self._key(entry).decode('utf-8'), self._postings(entry)
+
+    def live_bytes(self):
+        return sum(table + count * KEYWORD_ENTRY.size - start
+                   for start, table, count, _ in self.segments)
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _write_keyword_segment(f, postings):
+    """열린 파일 끝에 세그먼트 하나를 쓰고 세그먼트 목록 항목을 반환한다."""
+    f.seek(0, os.SEEK_END)
+    start = f.tell()
+    tokens = sorted(postings)  # str 순서 = UTF-8 바이트 순서
+    positions = []
+    for token in tokens:
+        positions.append(f.tell())
+        postings[token].tofile(f)
+    keys = [token.encode('utf-8') for token in tokens]
+    key_pos = f.tell()
+    f.write(b"".join(keys))
+    table = bytearray()
+    for key, position, token in zip(keys, positions, tokens):
+        table += KEYWORD_ENTRY.pack(key_pos, len(key), position, len(postings[token]))
+        key_pos += len(key)
+    table_offset = f.tell()
+    f.write(table)
+    return (start, table_offset, len(tokens), sum(len(p) for p in postings.values()))
+
+def _write_keyword_directory(f, segments, indexed_size):
+    f.seek(0, os.SEEK_END)
+    directory_offset = f.tell()
+    f.write(struct.pack("<I", len(segments)))
+    f.write(b"".join(KEYWORD_SEGMENT.pack(*segment) for segment in segments))
+    f.flush()
+    # 본문을 다 쓴 뒤 헤더를 바꾸므로, 중간에 실패해도 이전 목록이 그대로 유효함
+    f.seek(0)
+    f.write(KEYWORD_HEADER.pack(KEYWORD_MAGIC, indexed_size, directory_offset))
+
+def _write_keyword_index(index_path, postings, indexed_size):
+    # 세그먼트 하나짜리 인덱스를 임시 파일에 쓰고 교체
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'w+b') as f:
+        f.write(KEYWORD_HEADER.pack(KEYWORD_MAGIC, 0, 0))
+        segment = _write_keyword_segment(f, postings)
+        _write_keyword_directory(f, [segment], indexed_size)
+    os.replace(tmp_path, index_path)
+
+def update_keyword_index(log_path, index_path=None):
+    """event / message 토큰 역색인을 만들거나, 로그에 추가된 부분만 세그먼트로 덧붙인다."""
+    index_path = index_path or keyword_index_path_for(log_path)
+    log_size = os.path.getsize(log_path)
+
+    indexed_size = None
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, 'rb') as f:
+                indexed_size, _ = _read_keyword_header(f)
+        except (ValueError, struct.error):
+            indexed_size = None
+        if indexed_size == log_size:
+            return index_path  # 헤더만 읽고 끝
+    if indexed_size is None or indexed_size > log_size:
+        # 인덱스가 없거나 형식이 다르거나, 로그가 잘렸거나 교체됨 → 처음부터 다시 생성
+        indexed_size = None
+
+    postings = {}
+
+    def add_line(offset, parts):
+        for token in set(tokenize(parts[1] + " " + parts[2])):
+            if token not in postings:
+                postings[token] = array.array('Q')
+            postings[token].append(offset)
+
+    # 오프셋은 파일 순서대로 증가하므로 posting 은 항상 정렬된 상태로 유지됨
+    new_size = _scan_log(log_path, indexed_size or 0, add_line)
+    if indexed_size is None:
+        _write_keyword_index(index_path, postings, new_size)
+        return index_path
+    if new_size == indexed_size:
+        return index_path  # 아직 끝나지 않은 줄만 추가됨
+
+    with KeywordIndexReader(index_path) as reader:
+        segments = list(reader.segments)
+        # 새 posting 수의 KEYWORD_MERGE_RATIO 배 이하인 최근 세그먼트들을 함께 합침
+        total = sum(len(p) for p in postings.values())
+        keep = len(segments)
+        while keep > 0 and segments[keep - 1][3] <= total * KEYWORD_MERGE_RATIO:
+            keep -= 1
+            total += segments[keep][3]
+        if keep < len(segments):
+            merged = {}
+            for segment in segments[keep:]:
+                for token, offsets in reader.segment_postings(segment):
+                    merged.setdefault(token, array.array('Q')).extend(offsets)
+            for token, offsets in postings.items():
+                merged.setdefault(token, array.array('Q')).extend(offsets)
+            postings = merged
+        segments = segments[:keep]
+        live = reader.live_bytes()
+    file_size = os.path.getsize(index_path)
+
+    if not segments or file_size > 2 * live + 65536:
+        # 전부 합치게 되었거나 버려진 영역이 커짐 → 파일을 새로 씀
+        if segments:
+            with KeywordIndexReader(index_path) as reader:
+                merged = {}
+                for segment in segments:
+                    for token, offsets in reader.segment_postings(segment):
+                        merged.setdefault(token, array.array('Q')).extend(offsets)
+            for token, offsets in postings.items():
+                merged.setdefault(token, array.array('Q')).extend(offsets)
+            postings = merged
+        _write_keyword_index(index_path, postings, new_size)
+    else:
+        with open(index_path, 'r+b') as f:
+            segments.append(_write_keyword_segment(f, postings))
+            _write_keyword_directory(f, segments, new_size)
+    return index_path
+
+def _intersect_sorted(lists):
+    # 짧은 posting 부터 시작해, 긴 쪽은 bisect 로 앞으로만 이동하며 찾음
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        matched = array.array('Q')
+        lo, n = 0, len(other)
+        for value in result:
+            lo = bisect.bisect_left(other, value, lo)
+            if lo == n:
+                break
+            if other[lo] == value:
+                matched.append(value)
+        result = matched
+    return result
+
+def _union_sorted(lists):
+    result = array.array('Q')
+    last = None
+    for value in heapq.merge(*lists):
+        if value != last:
+            result.append(value)
+            last = value
+    return result
+
+def search_logs_by_keywords(log_path, keywords, mode="and"):
+    """키워드 목록으로 로그를 찾아 파일 순서대로 반환한다. mode 는 "and" 또는 "or"."""
+    index_path = update_keyword_index(log_path)
+    tokens = list(dict.fromkeys(token for keyword in keywords for token in tokenize(keyword)))
+    if not tokens:
+        return []
+
+    with KeywordIndexReader(index_path) as reader:
+        lists = []
+        for token in tokens:
+            postings = reader.postings(token)
+            if not postings and mode != "or":
+                return []  # 없는 토큰이 하나라도 있으면 AND 결과는 비어 있음
+            lists.append(postings)
+
+    matched = _union_sorted(lists) if mode == "or" else _intersect_sorted(lists)
+    with open(log_path, 'rb') as log_file:
+        return [_read_log_at(log_file, offset) for offset in matched]
 
 # ----------------------------------------
 # 🧪 실행 흐름
 # ----------------------------------------
 
-log_path = "mission_computer_main.log"
-json_path = "mission_computer_main.json"
+if __name__ == "__main__":
+    log_path = "mission_computer_main.log"
+    json_path = "mission_computer_main.json"
+
+    # 병렬 파싱 프로세스 수 (python main02.py --workers 4)
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 0
 
-# 1. 로그 파일 읽기
-lines = read_log_file(log_path)
+    if workers:
+        # 1~6. 병렬 변환 (파싱, 시간 역순 정렬, JSON 변환을 각 프로세스에서 처리)
+        convert_log_to_json_parallel(log_path, json_path, workers=workers)
+        update_keyword_index(log_path)
+    else:
+        # 1. 로그 파일 읽기
+        lines = read_log_file(log_path)
 
-# 2. 리스트 변환
-log_list = parse_lines_to_list(lines)
+        # 2. 리스트 변환 (키워드 역색인도 함께 갱신)
+        log_list = parse_lines_to_list(lines)
+        update_keyword_index(log_path)
 
-# 3. 리스트 출력
-print_log_list(log_list)
+        # 3. 리스트 출력
+        print_log_list(log_list)
 
-# 4. 리스트 시간 역순 정렬
-sorted_logs = sort_logs_desc(log_list)
+        # 4. 리스트 시간 역순 정렬
+        sorted_logs = sort_logs_desc(log_list)
 
-# 5. 딕셔너리 변환
-log_dict = convert_list_to_dict(sorted_logs)
+        # 5. 딕셔너리 변환
+        log_dict = convert_list_to_dict(sorted_logs)
 
-# 6. JSON 파일로 저장
-save_as_json(log_dict, json_path)
+        # 6. JSON 파일로 저장
+        save_as_json(log_dict, json_path)
 
-# 7. 보너스 과제 실행
-# 직접 키워드 입력 가능 (아래 라인 주석 해제 시)
-# keyword = input("\n검색할 키워드를 입력하세요: ")
-# search_logs_by_keyword(json_path, keyword)
+    # 7. 보너스 과제 실행
+    # 직접 키워드 입력 가능 (아래 라인 주석 해제 시)
+    # keyword = input("\n검색할 키워드를 입력하세요: ")
+    # search_logs_by_keyword(log_path, keyword)
+
+    # 자동 실행 예시 (Oxygen 키워드 검색, 2단계에서 갱신한 역색인 사용)
+    search_logs_by_keyword(log_path, "Oxygen")
+
+    # 8. 타임스탬프 인덱스로 시간 범위 / 최근 로그 조회
+    print("\n⏱ 11:30 ~ 11:40 사이 로그:")
+    for log in query_time_range(log_path, "2023-08-27 11:30:00", "2023-08-27 11:40:00"):
+        print(log)
 
-# 자동 실행 예시 (Oxygen 키워드 검색)
-search_logs_by_keyword(json_path, "Oxygen")
+    print("\n⏱ 최근 3개 로그:")
+    for log in query_last_events(log_path, 3):
+        print(log)
+
+    # 9. 키워드 역색인으로 여러 키워드 검색
+    print("\n🔎 'oxygen' AND 'tank' 로그:")
+    for log in search_logs_by_keywords(log_path, ["oxygen", "tank"]):
+        print(log)
+
+    print("\n🔎 'explosion' OR 'unstable' 로그:")
+    for log in search_logs_by_keywords(log_path, ["explosion", "unstable"], mode="or"):
+        print(log)
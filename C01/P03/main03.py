@@ -1,3 +1,10 @@
+import array
+import heapq
+import math
+import mmap
+import struct
+import sys
+
 filename = r'D:\SW CAMP with Codyssey\C01\P03\Mars_Base_Inventory_List.csv'
 danger_filename = r'D:\SW CAMP with Codyssey\C01\P03\Mars_Base_Inventory_danger.csv'
 bin_filename = r'D:\SW CAMP with Codyssey\C01\P03\Mars_Base_Inventory_List.bin'
@@ -31,31 +38,261 @@ def write_csv(file_path, data):
     except Exception as e:
         print('❌ 파일 저장 중 오류 발생:', e)
 
+# ----------------------------------------
+# 🗃️ 컬럼형 이진 인벤토리 형식
+# ----------------------------------------
+# [헤더 16B] magic, version, 예약, 행 수, 문자열 수
+# [float64 열 x 3] Weight, Specific Gravity, Flammability (숫자가 아니면 NaN)
+# [uint32 열 x 2]  Substance, Strength → 문자열 테이블 번호
+# [숫자 열마다] uint32 개수, uint32 행 번호 x 개수, uint32 문자열 번호 x 개수
+#               → 원래 글자가 숫자를 다시 글자로 바꾼 것과 다른 칸
+#                 ('Various', '', '0.70', '007', '-0.0', '1e3' 등)
+# [필드 수가 5개가 아닌 행] uint32 개수, uint32 행 번호 x 개수, uint32 문자열 번호 x 개수
+#               → 쉼표로 합친 원래 행 전체 (열 값은 앞쪽 필드로 채우고 없는 필드는 빈 칸)
+# [uint32 x (문자열 수 + 1)] 문자열 테이블 오프셋
+# [utf-8 바이트] 문자열 테이블 (0번은 쉼표로 합친 CSV 헤더 줄)
+# 모든 값은 리틀 엔디언이며, mmap + memoryview 로 파싱 없이 바로 읽을 수 있다.
+
+BIN_MAGIC = b'MBIV'
+BIN_VERSION = 3
+BIN_HEADER = struct.Struct('<4sHHII')
+FLOAT_COLUMNS = (1, 2, 4)   # Weight, Specific Gravity, Flammability
+STRING_COLUMNS = (0, 3)     # Substance, Strength
+ROW_FIELDS = len(FLOAT_COLUMNS) + len(STRING_COLUMNS)
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def _format_float(value):
+    # 정수값은 '12' 처럼, 나머지는 repr 로 (float64 값을 잃지 않음)
+    if value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value)
+
+def _read_id_table(buffer, pos):
+    # (uint32 개수, 행 번호들, 문자열 번호들) → ({행 번호: 문자열 번호}, 다음 위치)
+    (n,) = struct.unpack_from('<I', buffer, pos)
+    rows = struct.unpack_from(f'<{n}I', buffer, pos + 4)
+    ids = struct.unpack_from(f'<{n}I', buffer, pos + 4 + n * 4)
+    return dict(zip(rows, ids)), pos + 4 + n * 8
+
 def write_bin(file_path, data):
     try:
+        header, items = (data[0], data[1:]) if data else ([''], [])
+        strings = [','.join(header)]
+        string_ids = {}
+
+        def string_id(text):
+            if text not in string_ids:
+                string_ids[text] = len(strings)
+                strings.append(text)
+            return string_ids[text]
+
+        float_columns = [array.array('d') for _ in FLOAT_COLUMNS]
+        id_columns = [array.array('I') for _ in STRING_COLUMNS]
+        # 숫자 열에서 원래 글자를 따로 보관할 칸: (행 번호 목록, 문자열 번호 목록)
+        text_columns = [(array.array('I'), array.array('I')) for _ in FLOAT_COLUMNS]
+        # 필드 수가 5개가 아닌 행: (행 번호 목록, 원래 행의 문자열 번호 목록)
+        odd_rows = (array.array('I'), array.array('I'))
+        for r, row in enumerate(items):
+            if len(row) != ROW_FIELDS:
+                odd_rows[0].append(r)
+                odd_rows[1].append(string_id(','.join(row)))
+                row = (list(row) + [''] * ROW_FIELDS)[:ROW_FIELDS]
+            for column, texts, index in zip(float_columns, text_columns, FLOAT_COLUMNS):
+                text = row[index]
+                value = _to_float(text)
+                if value is None:
+                    value = math.nan
+                if _format_float(value) != text:
+                    texts[0].append(r)
+                    texts[1].append(string_id(text))
+                column.append(value)
+            for column, index in zip(id_columns, STRING_COLUMNS):
+                column.append(string_id(row[index]))
+
+        encoded = [text.encode('utf-8') for text in strings]
+        offsets = array.array('I', [0])
+        for blob in encoded:
+            offsets.append(offsets[-1] + len(blob))
+
+        columns = float_columns + id_columns
+        for rows, ids in text_columns + [odd_rows]:
+            columns += [array.array('I', [len(rows)]), rows, ids]
+        columns.append(offsets)
+        if sys.byteorder != 'little':
+            for column in columns:
+                column.byteswap()
+
         with open(file_path, 'wb') as f:
-            for row in data:
-                # 각 행을 쉼표로 합친 후 utf-8 인코딩, 줄바꿈(\n) 포함
-                line = ','.join(row) + '\n'
-                f.write(line.encode('utf-8'))
+            f.write(BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, 0, len(items), len(strings)))
+            for column in columns:
+                column.tofile(f)
+            f.write(b''.join(encoded))
         print(f'✅ 이진 파일 저장 완료 → {file_path}')
     except Exception as e:
         print('❌ 이진 파일 저장 중 오류 발생:', e)
 
+class BinaryInventory:
+    """컬럼형 이진 인벤토리 파일을 mmap 으로 열어 복사 없이 읽는다.
+
+    weight, specific_gravity, flammability 는 float 의 memoryview,
+    substance_ids, strength_ids 는 문자열 테이블 번호의 memoryview 이다.
+    """
+
+    def __init__(self, file_path):
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+
+        magic, version, _, rows, count = BIN_HEADER.unpack_from(self._map, 0)
+        if magic != BIN_MAGIC or version != BIN_VERSION:
+            self.close()
+            raise ValueError('인벤토리 이진 파일 형식이 아닙니다.')
+        if sys.byteorder != 'little':
+            self.close()
+            raise ValueError('빅 엔디언 환경에서는 직접 매핑할 수 없습니다.')
+        self.rows = rows
+
+        pos = BIN_HEADER.size
+        float_views = []
+        for _ in FLOAT_COLUMNS:
+            float_views.append(self._view[pos:pos + rows * 8].cast('d'))
+            pos += rows * 8
+        id_views = []
+        for _ in STRING_COLUMNS:
+            id_views.append(self._view[pos:pos + rows * 4].cast('I'))
+            pos += rows * 4
+        # 숫자 열별 {행 번호: 원래 글자의 문자열 번호}
+        self._texts = []
+        for _ in FLOAT_COLUMNS:
+            texts, pos = _read_id_table(self._map, pos)
+            self._texts.append(texts)
+        # {행 번호: 원래 행 전체의 문자열 번호} (필드 수가 5개가 아닌 행)
+        self._odd_rows, pos = _read_id_table(self._map, pos)
+        self._offsets = self._view[pos:pos + (count + 1) * 4].cast('I')
+        self._strings_start = pos + (count + 1) * 4
+
+        self.weight, self.specific_gravity, self.flammability = float_views
+        self.substance_ids, self.strength_ids = id_views
+        self.header = self.string(0).split(',')
+
+    def string(self, index):
+        start = self._strings_start + self._offsets[index]
+        end = self._strings_start + self._offsets[index + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def _cell(self, column, texts, i):
+        # 원래 글자를 보관한 칸은 그 글자로, 나머지는 숫자를 글자로 바꿈
+        text_id = texts.get(i)
+        if text_id is not None:
+            return self.string(text_id)
+        return _format_float(column[i])
+
+    def row(self, i):
+        odd = self._odd_rows.get(i)
+        if odd is not None:
+            return self.string(odd).split(',')
+        weight_texts, gravity_texts, flammability_texts = self._texts
+        return [
+            self.string(self.substance_ids[i]),
+            self._cell(self.weight, weight_texts, i),
+            self._cell(self.specific_gravity, gravity_texts, i),
+            self.string(self.strength_ids[i]),
+            self._cell(self.flammability, flammability_texts, i)
+        ]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+    def __iter__(self):
+        for i in range(self.rows):
+            yield self.row(i)
+
+    def close(self):
+        # memoryview 를 모두 해제해야 mmap 을 닫을 수 있음
+        for name in ('weight', 'specific_gravity', 'flammability',
+                     'substance_ids', 'strength_ids', '_offsets'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if hasattr(self, '_view'):
+            self._view.release()
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 def read_bin(file_path):
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
-            # utf-8로 디코딩 후 줄 단위 분리
-            lines = content.decode('utf-8').strip().split('\n')
-            data = [line.split(',') for line in lines]
-        return data
+        with BinaryInventory(file_path) as inventory:
+            return [inventory.header] + list(inventory)
     except FileNotFoundError:
         print('❌ 이진 파일을 찾을 수 없습니다.')
     except Exception as e:
         print('❌ 이진 파일 읽기 중 오류 발생:', e)
     return []
 
+# ----------------------------------------
+# 🔥 인화성 질의 (전체 정렬 없이 임계값 / 상위 K개 조회)
+# ----------------------------------------
+
+class FlammabilityQuery:
+    """인화성 열을 한 번만 숫자 배열로 바꿔 두고 임계값 / 상위 K개 질의에 답한다.
+
+    items 는 행 리스트 또는 BinaryInventory 처럼 번호로 행을 꺼낼 수 있는 객체이다.
+    숫자로 바꿀 수 없는 값은 safe_float 와 같이 -1 로 취급한다.
+    """
+
+    def __init__(self, items, values=None):
+        self.items = items
+        if values is None:
+            values = array.array('d', (safe_float(row[4]) for row in items))
+        self.values = values
+
+    @classmethod
+    def from_bin(cls, inventory):
+        # 이진 파일의 인화성 열을 그대로 사용 (NaN 만 -1 로 바꿈)
+        values = array.array('d', inventory.flammability)
+        for i, value in enumerate(values):
+            if math.isnan(value):
+                values[i] = -1
+        return cls(inventory, values)
+
+    def _rows(self, indices):
+        return [self.items[i] for i in indices]
+
+    def above(self, threshold):
+        """인화성이 threshold 이상인 행을 내림차순으로 반환 (해당 행만 정렬)."""
+        values = self.values
+        indices = [i for i in range(len(values)) if values[i] >= threshold]
+        indices.sort(key=values.__getitem__, reverse=True)
+        return self._rows(indices)
+
+    def top_k(self, k):
+        """인화성이 가장 높은 k개 행을 힙 선택으로 반환 (O(n log k))."""
+        indices = heapq.nlargest(k, range(len(self.values)), key=self.values.__getitem__)
+        return self._rows(indices)
+
+    def sorted_desc(self):
+        """전체 행을 인화성 내림차순으로 반환."""
+        indices = sorted(range(len(self.values)), key=self.values.__getitem__, reverse=True)
+        return self._rows(indices)
+
 def main():
     inventory = read_csv(filename)
     if not inventory:
@@ -64,11 +301,14 @@ def main():
     header = inventory[0]
     items = inventory[1:]
 
+    # 인화성 열을 한 번만 숫자로 변환
+    query = FlammabilityQuery(items)
+
     # 인화성 기준 내림차순 정렬
-    items.sort(key=lambda x: safe_float(x[4]), reverse=True)
+    items = query.sorted_desc()
 
-    # 인화성 0.7 이상인 항목 필터링
-    danger_items = [row for row in items if safe_float(row[4]) >= 0.7]
+    # 인화성 0.7 이상인 항목 필터링 (해당 항목만 정렬)
+    danger_items = query.above(0.7)
 
     # 전체 정렬된 목록 출력
     print('▶ 전체 정렬된 적재 화물 목록:')
@@ -95,5 +335,11 @@ def main():
     for row in bin_data:
         print(row)
 
+    # 이진 파일에서 바로 인화성 상위 5개 조회
+    print('\n▶ 인화성 상위 5개 (이진 파일):')
+    with BinaryInventory(bin_filename) as inventory:
+        for row in FlammabilityQuery.from_bin(inventory).top_k(5):
+            print(row)
+
 if __name__ == '__main__':
     main()
@@ -1,5 +1,10 @@
 # design_dome.py
 
+import sys
+import warnings
+
+import numpy as np
+
 # 🎯 전역변수 선언
 material = ""
 diameter = 0.0
@@ -39,48 +44,142 @@ def sphere_area(diameter, material="유리", thickness=1.0):
 
     return round(area,3), weight
 
+# ⚡ 여러 설계를 한 번에 계산하는 배치 함수 (NumPy 벡터 연산)
+def sphere_area_batch(diameters, materials, thicknesses=1.0):
+    """지름(m), 재질, 두께(cm) 배열을 받아 (면적 cm², 화성 무게 kg) 배열을 반환한다.
+
+    지원하지 않는 재질이거나 지름이 0 이하인 설계는 결과가 NaN 이 된다.
+    전역변수는 건드리지 않는다.
+    """
+    diameters = np.asarray(diameters, dtype=float)
+    thicknesses = np.broadcast_to(np.asarray(thicknesses, dtype=float), diameters.shape)
+
+    # 재질 이름 → 밀도 (고유값마다 한 번만 조회)
+    names, inverse = np.unique(np.asarray(materials, dtype=str), return_inverse=True)
+    lookup = np.array([material_density.get(name, np.nan) for name in names], dtype=float)
+    densities = lookup[inverse.reshape(-1)].reshape(diameters.shape)
+
+    r = (diameters / 2) * 100
+    areas = np.round(2 * 3.1415926535 * r**2, 3)
+    weights = np.round(areas * thicknesses * densities * mars_gravity / 1000, 3)
+
+    invalid = diameters <= 0
+    areas = np.where(invalid, np.nan, areas)
+    weights = np.where(invalid | np.isnan(densities), np.nan, weights)
+    return areas, weights
+
+def _parse_thickness(text):
+    # 두께 칸이 비어 있으면 기본값 1cm
+    text = text.strip()
+    return float(text) if text else 1.0
+
+def load_designs(file_path):
+    """설계 목록(diameter, thickness, material)을 CSV 또는 .npy 에서 읽어 세 배열로 반환한다."""
+    if file_path.endswith(".npy"):
+        designs = np.load(file_path)
+        return designs["diameter"], designs["thickness"], designs["material"]
+
+    # 헤더로 열 위치를 찾고, 본문은 np.loadtxt 로 열 타입을 지정해 한 번에 읽음
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        header = [name.strip() for name in f.readline().rstrip("\r\n").split(",")]
+        usecols = [header.index("diameter"), header.index("material")]
+        dtype = [("diameter", float), ("material", object)]
+        converters = {}
+        if "thickness" in header:
+            usecols.append(header.index("thickness"))
+            dtype.append(("thickness", float))
+            converters[header.index("thickness")] = _parse_thickness
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # 본문이 없는 파일
+            designs = np.loadtxt(f, delimiter=",", usecols=usecols, dtype=dtype,
+                                 converters=converters, ndmin=1)
+
+    # 재질 이름은 종류가 적으므로 고유값만 공백을 정리
+    names, inverse = np.unique(designs["material"].astype(str), return_inverse=True)
+    materials = np.array([name.strip() for name in names.tolist()], dtype=str)[inverse.reshape(-1)]
+    if "thickness" in header:
+        thicknesses = designs["thickness"]
+    else:
+        thicknesses = np.ones(len(designs))
+    return designs["diameter"], thicknesses, materials
+
+def save_results(file_path, diameters, thicknesses, materials, areas, weights):
+    # 결과 CSV 저장 (면적은 m² 단위로 변환), 열 단위로 문자열을 만든 뒤 한 번에 기록
+    columns = [np.asarray(materials, dtype=str).tolist()]
+    for values in (diameters, thicknesses, np.round(areas / 10000, 3), weights):
+        columns.append(list(map("%.3f".__mod__, np.asarray(values, dtype=float).tolist())))
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        f.write("material,diameter,thickness,area_m2,weight_kg\r\n")
+        f.writelines(map("%s,%s,%s,%s,%s\r\n".__mod__, zip(*columns)))
+
+def run_batch(input_path, output_path="dome_results.csv"):
+    try:
+        diameters, thicknesses, materials = load_designs(input_path)
+        areas, weights = sphere_area_batch(diameters, materials, thicknesses)
+        save_results(output_path, diameters, thicknesses, materials, areas, weights)
+        invalid = int(np.isnan(weights).sum())
+        print(f"✅ {len(weights)}개 설계 계산 완료 → {output_path} (계산 불가 {invalid}개)")
+    except FileNotFoundError:
+        print("❌ 설계 파일을 찾을 수 없습니다.")
+    except (KeyError, ValueError) as e:
+        print(f"❌ 설계 파일 형식이 올바르지 않습니다: {e}")
+
 # 🎁 보너스 과제: 예외 처리 포함 사용자 입력 반복
-while True:
-    print("\n🏗️ 반구형 돔 무게 계산기 (종료하려면 'q' 입력)")
+def run_interactive():
+    global material, diameter, thickness
 
-    # 지름 입력
-    diameter_input = input("지름을 입력하세요 (단위: m): ")
-    if diameter_input.lower() == 'q':
-        print("프로그램을 종료합니다.")
-        break
+    while True:
+        print("\n🏗️ 반구형 돔 무게 계산기 (종료하려면 'q' 입력)")
+
+        # 지름 입력
+        diameter_input = input("지름을 입력하세요 (단위: m): ")
+        if diameter_input.lower() == 'q':
+            print("프로그램을 종료합니다.")
+            break
 
-    try:
-        diameter = float(diameter_input)
-        if diameter == 0:
-            print("❌ 지름은 0이 될 수 없습니다.")
-            continue
-    except ValueError:
-        print("❌ 숫자 형식으로 입력해주세요.")
-        continue
-
-    # 재질 입력
-    material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강): ")
-    if material_input not in material_density:
-        print("❌ 지원하지 않는 재질입니다. (유리, 알루미늄, 탄소강 중 선택)")
-        continue
-    material = material_input
-
-    # 두께 입력
-    thickness_input = input("두께를 입력하세요 (단위: cm, 기본값 1): ")
-    if thickness_input == "":
-        thickness = 1.0
-    else:
         try:
-            thickness = float(thickness_input)
+            diameter = float(diameter_input)
+            if diameter == 0:
+                print("❌ 지름은 0이 될 수 없습니다.")
+                continue
         except ValueError:
             print("❌ 숫자 형식으로 입력해주세요.")
             continue
 
-    # 함수 호출
-    sphere_area(diameter, material, thickness)
+        # 재질 입력
+        material_input = input("재질을 입력하세요 (유리, 알루미늄, 탄소강): ")
+        if material_input not in material_density:
+            print("❌ 지원하지 않는 재질입니다. (유리, 알루미늄, 탄소강 중 선택)")
+            continue
+        material = material_input
+
+        # 두께 입력
+        thickness_input = input("두께를 입력하세요 (단위: cm, 기본값 1): ")
+        if thickness_input == "":
+            thickness = 1.0
+        else:
+            try:
+                thickness = float(thickness_input)
+            except ValueError:
+                print("❌ 숫자 형식으로 입력해주세요.")
+                continue
+
+        # 함수 호출
+        sphere_area(diameter, material, thickness)
     
-    # 면적 단위 변환: cm² → m²
-    area_m2 = round(area / 10000, 3)
-
-    # 결과 출력 (소수점 이하 3자리까지)
-    print(f"재질 ⇒ {material}, 지름 ⇒ {diameter:.3f}, 두께 ⇒ {thickness:.3f}, 면적 ⇒ {area_m2:.3f} m², 무게 ⇒ {weight:.3f} kg")
+        # 면적 단위 변환: cm² → m²
+        area_m2 = round(area / 10000, 3)
+
+        # 결과 출력 (소수점 이하 3자리까지)
+        print(f"재질 ⇒ {material}, 지름 ⇒ {diameter:.3f}, 두께 ⇒ {thickness:.3f}, 면적 ⇒ {area_m2:.3f} m², 무게 ⇒ {weight:.3f} kg")
+
+# 🎯 실행 (배치 계산: python design_dome.py --batch designs.csv [결과.csv])
+if __name__ == "__main__":
+    if "--batch" in sys.argv:
+        args = sys.argv[sys.argv.index("--batch") + 1:]
+        if not args:
+            print("사용법: python design_dome.py --batch 설계파일.csv [결과.csv]")
+        else:
+            run_batch(*args[:2])
+    else:
+        run_interactive()
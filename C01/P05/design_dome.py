@@ -1,37 +1,368 @@
+import glob
+import hashlib
+import itertools
+import json
+import os
+
 import numpy as np
 
 # 파일 경로 지정
+base_dir = "D:/SW CAMP with Codyssey/C01/P05"
 file1 = "D:/SW CAMP with Codyssey/C01/P05/mars_base_main_parts-001.csv"
 file2 = "D:/SW CAMP with Codyssey/C01/P05/mars_base_main_parts-002.csv"
 file3 = "D:/SW CAMP with Codyssey/C01/P05/mars_base_main_parts-003.csv"
 
-# CSV 파일을 ndarray로 읽기 (헤더 제외)
-arr1 = np.genfromtxt(file1, delimiter=',', skip_header=1)
-arr2 = np.genfromtxt(file2, delimiter=',', skip_header=1)
-arr3 = np.genfromtxt(file3, delimiter=',', skip_header=1)
-
-# 배열 합치기
-parts = np.vstack((arr1, arr2, arr3))
-
-# 평균값 계산
-mean_values = np.mean(parts, axis=0)
-
-# 평균값이 50 미만인 행 추출
-low_parts = parts[np.mean(parts, axis=1) < 50]
-
-# 결과 저장
-output_path = "D:/SW CAMP with Codyssey/C01/P05/parts_to_work_on.csv"
-try:
-    np.savetxt(output_path, low_parts, delimiter=",", fmt="%.3f")
-    print(f"✅ parts_to_work_on.csv 저장 완료: {output_path}")
-except Exception as e:
-    print(f"❌ 저장 중 오류 발생: {e}")
-
-# 🎁 보너스 과제
-try:
-    parts2 = np.genfromtxt(output_path, delimiter=",")
-    parts3 = parts2.T  # 전치행렬
-    print("📐 전치 행렬:")
-    print(np.round(parts3, 3))
-except Exception as e:
-    print(f"❌ 보너스 과제 수행 중 오류 발생: {e}")
+# 한 번에 메모리에 올리는 최대 행 수
+CHUNK_ROWS = 65536
+
+
+# ----------------------------------------
+# 📥 parts CSV 전용 로더 (이름 열과 숫자 열을 따로 파싱)
+# ----------------------------------------
+# np.genfromtxt 는 parts 이름을 NaN 으로 바꾸고, 빈 칸과 글자를 구분하지 못한다.
+# 이름은 문자열 배열로, 나머지 열은 float 배열로 따로 만들고 빈 칸만 NaN 으로 둔다.
+
+def parse_part_lines(lines, value_cols):
+    # "이름,값1,값2,..." 줄 목록 → (이름 배열, (행 수, value_cols) float 배열)
+    rows = [line.strip().partition(",") for line in lines if line.strip()]
+    names = np.array([row[0] for row in rows], dtype=str)
+    rests = [row[2] for row in rows]
+    if not rests:
+        return names, np.empty((0, value_cols))
+
+    try:
+        # 빈 칸이 없는 일반적인 경우: numpy 의 C 파서로 한 번에 변환
+        values = np.loadtxt(rests, delimiter=",", ndmin=2)
+        if values.shape[1] == value_cols:
+            return names, values
+    except ValueError:
+        pass
+
+    # 빈 칸(결측값)이 있거나 열 수가 맞지 않는 줄이 있으면 칸 단위로 처리
+    values = np.full((len(rests), value_cols), np.nan)
+    for i, rest in enumerate(rests):
+        for j, cell in enumerate(rest.split(",")[:value_cols]):
+            if cell.strip():
+                values[i, j] = float(cell)
+    return names, values
+
+
+def read_part_header(f):
+    # BOM 은 utf-8-sig 인코딩으로 열어서 제거
+    return f.readline().strip().split(",")
+
+
+def load_parts(file_path):
+    """parts CSV 를 (헤더, 이름 배열, 숫자 배열)로 읽는다."""
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        header = read_part_header(f)
+        names, values = parse_part_lines(f.readlines(), len(header) - 1)
+    return header, names, values
+
+
+def save_parts(f, names, values):
+    # 이름 열을 유지한 채로 "이름,값,..." 형식으로 기록
+    for name, row in zip(names, values):
+        f.write(name + "," + ",".join(f"{value:.3f}" for value in row) + "\n")
+
+
+# ----------------------------------------
+# 🌊 청크 단위 스트리밍 처리 (파일 크기와 관계없이 메모리 일정)
+# ----------------------------------------
+
+def iter_part_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    # CSV 파일을 chunk_rows 행씩 읽어 (헤더, 이름 배열, 숫자 배열)로 돌려준다
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        header = read_part_header(f)
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            names, values = parse_part_lines(lines, len(header) - 1)
+            if len(names):
+                yield header, names, values
+
+
+def merge_parts(files, output_path, chunk_rows=CHUNK_ROWS):
+    """여러 parts CSV 를 청크 단위로 읽으며 열 평균을 누적하고,
+    행 평균이 50 미만인 행은 부품 이름과 함께 곧바로 output_path 에 기록한다.
+    열 평균(결측값 제외)을 반환한다."""
+    col_sum = None
+    col_count = None
+    with open(output_path, "w", encoding="utf-8") as out:
+        for file_path in files:
+            for header, names, values in iter_part_chunks(file_path, chunk_rows):
+                if col_sum is None:
+                    out.write(",".join(header) + "\n")
+                    col_sum = np.zeros(values.shape[1])
+                    col_count = np.zeros(values.shape[1])
+                col_sum += np.nansum(values, axis=0)
+                col_count += np.count_nonzero(~np.isnan(values), axis=0)
+
+                with np.errstate(invalid="ignore"):
+                    low = np.nanmean(values, axis=1) < 50
+                save_parts(out, names[low], values[low])
+
+    if col_sum is None:
+        return np.array([])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return col_sum / col_count
+
+
+# ----------------------------------------
+# 💾 병합 결과 캐시 (.npy + mmap)
+# ----------------------------------------
+# parts_to_work_on 결과를 이름 / 숫자 .npy 로 저장해 두고, 원본 파일의
+# (크기, 수정 시각, 해시)가 그대로면 CSV 를 다시 파싱하지 않고 mmap 으로 연다.
+
+def _file_hash(file_path):
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(cache_dir):
+    return (os.path.join(cache_dir, "meta.json"),
+            os.path.join(cache_dir, "names.npy"),
+            os.path.join(cache_dir, "values.npy"))
+
+
+def _sources_unchanged(files, sources):
+    # 반환값: (원본이 그대로인지, 해시 확인 후 sources 의 수정 시각을 새로 고쳤는지)
+    if sorted(sources) != sorted(os.path.abspath(path) for path in files):
+        return False, False
+    refreshed = False
+    for path, source in sources.items():
+        if not os.path.exists(path):
+            return False, False
+        signature = _file_signature(path)
+        if signature == source["signature"]:
+            continue
+        # 수정 시각만 바뀐 경우(복사, touch 등)는 내용 해시로 한 번 더 확인
+        if signature[0] != source["signature"][0] or _file_hash(path) != source["sha1"]:
+            return False, False
+        source["signature"] = signature
+        refreshed = True
+    return True, refreshed
+
+
+def open_parts_cache(files, cache_dir):
+    """캐시가 유효하면 (이름, 숫자 배열, 열 평균)을 mmap 으로 열어 반환하고, 아니면 None."""
+    meta_path, names_path, values_path = _cache_paths(cache_dir)
+    if not all(os.path.exists(path) for path in (meta_path, names_path, values_path)):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    unchanged, refreshed = _sources_unchanged(files, meta["sources"])
+    if not unchanged:
+        return None
+
+    if refreshed:
+        # 해시로 확인한 새 수정 시각을 기록해 다음 실행은 해시 없이 통과
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+    names = np.load(names_path, mmap_mode="r")
+    values = np.load(values_path, mmap_mode="r")
+    return names, values, np.array(meta["mean_values"])
+
+
+def save_parts_cache(files, cache_dir, names, values, mean_values):
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path, names_path, values_path = _cache_paths(cache_dir)
+    np.save(names_path, np.asarray(names, dtype=str))
+    np.save(values_path, np.asarray(values, dtype=float))
+    sources = {
+        os.path.abspath(path): {"signature": _file_signature(path), "sha1": _file_hash(path)}
+        for path in files
+    }
+    # 메타 파일을 마지막에 써서, 중간에 실패하면 캐시가 무효로 보이도록 함
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"sources": sources, "mean_values": list(map(float, mean_values))}, f,
+                  ensure_ascii=False)
+
+
+def load_merged_parts(files, output_path, cache_dir, chunk_rows=CHUNK_ROWS):
+    """병합 결과를 캐시에서 열고, 원본이 바뀌었을 때만 다시 병합한다.
+
+    반환값: (이름 배열, 숫자 배열, 열 평균, 캐시 사용 여부)
+    """
+    cached = open_parts_cache(files, cache_dir)
+    if cached is not None and os.path.exists(output_path):
+        return cached + (True,)
+
+    mean_values = merge_parts(files, output_path, chunk_rows)
+    _, names, values = load_parts(output_path)
+    save_parts_cache(files, cache_dir, names, values, mean_values)
+    names, values, mean_values = open_parts_cache(files, cache_dir)
+    return names, values, mean_values, False
+
+
+# ----------------------------------------
+# 📊 부품별 그룹 집계 (평균 / 최소 / 최대 / 표준편차)
+# ----------------------------------------
+# 부품 이름마다 (개수, 평균, 편차제곱합, 최소, 최대)를 유지한다.
+# 이 값들은 서로 합칠 수 있으므로 새 파일이 들어오면 그 파일만 집계해서 병합한다.
+
+STATS_FIELDS = ("count", "mean", "m2", "min", "max")
+
+
+def aggregate_by_part(names, values):
+    """이름 배열과 숫자 배열을 부품 이름별로 집계한다 (np.unique + bincount 벡터 연산)."""
+    groups, inverse = np.unique(names, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    n_groups, n_cols = len(groups), values.shape[1]
+
+    stats = {field: np.zeros((n_groups, n_cols)) for field in STATS_FIELDS}
+    stats["min"][:] = np.inf
+    stats["max"][:] = -np.inf
+    for j in range(n_cols):
+        column = values[:, j]
+        valid = ~np.isnan(column)
+        idx, col = inverse[valid], column[valid]
+
+        count = np.bincount(idx, minlength=n_groups).astype(float)
+        total = np.bincount(idx, weights=col, minlength=n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, 0.0)
+        stats["count"][:, j] = count
+        stats["mean"][:, j] = mean
+        stats["m2"][:, j] = np.bincount(idx, weights=(col - mean[idx]) ** 2, minlength=n_groups)
+        np.minimum.at(stats["min"][:, j], idx, col)
+        np.maximum.at(stats["max"][:, j], idx, col)
+
+    stats["names"] = groups
+    return stats
+
+
+def merge_part_stats(a, b):
+    """두 집계 결과를 합친다 (Chan 의 병렬 분산 공식)."""
+    if a is None:
+        return b
+    names = np.union1d(a["names"], b["names"])
+    n_cols = a["mean"].shape[1]
+    merged = {field: np.zeros((len(names), n_cols)) for field in STATS_FIELDS}
+    merged["min"][:] = np.inf
+    merged["max"][:] = -np.inf
+
+    ia = np.searchsorted(names, a["names"])
+    ib = np.searchsorted(names, b["names"])
+    for field in STATS_FIELDS:
+        merged[field][ia] = a[field]
+
+    count_a = merged["count"][ib]
+    mean_a = merged["mean"][ib]
+    count = count_a + b["count"]
+    delta = b["mean"] - mean_a
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(count > 0, b["count"] / count, 0.0)
+    merged["mean"][ib] = mean_a + delta * ratio
+    merged["m2"][ib] = merged["m2"][ib] + b["m2"] + delta ** 2 * count_a * ratio
+    merged["count"][ib] = count
+    merged["min"][ib] = np.minimum(merged["min"][ib], b["min"])
+    merged["max"][ib] = np.maximum(merged["max"][ib], b["max"])
+    merged["names"] = names
+    return merged
+
+
+def part_std(stats):
+    # 모집단 표준편차 (np.std 기본값과 동일)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(np.where(stats["count"] > 0, stats["m2"] / stats["count"], np.nan))
+
+
+def _file_signature(file_path):
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load_part_stats(cache_path):
+    # 저장된 집계 결과와 이미 반영한 파일 목록을 읽는다
+    if not os.path.exists(cache_path):
+        return None, {}
+    with np.load(cache_path, allow_pickle=False) as data:
+        stats = {field: data[field] for field in STATS_FIELDS}
+        stats["names"] = data["names"]
+        sources = json.loads(str(data["sources"]))
+    return stats, sources
+
+
+def save_part_stats(cache_path, stats, sources):
+    with open(cache_path, "wb") as f:
+        np.savez(f, sources=json.dumps(sources), **stats)
+
+
+def update_part_stats(files, cache_path, chunk_rows=CHUNK_ROWS):
+    """새로 들어온 parts 파일만 집계해서 저장된 부품별 통계에 병합한다.
+
+    이미 반영한 파일이 바뀌었거나 목록에서 빠졌다면 통계를 처음부터 다시 만든다.
+    """
+    stats, sources = load_part_stats(cache_path)
+    current = {os.path.abspath(path): _file_signature(path) for path in files}
+    if any(current.get(path) != signature for path, signature in sources.items()):
+        stats, sources = None, {}
+
+    for path, signature in current.items():
+        if path in sources:
+            continue
+        for _, names, values in iter_part_chunks(path, chunk_rows):
+            stats = merge_part_stats(stats, aggregate_by_part(names, values))
+        sources[path] = signature
+
+    if stats is not None:
+        save_part_stats(cache_path, stats, sources)
+    return stats
+
+
+def print_part_stats(stats, header):
+    std = part_std(stats)
+    for j, column in enumerate(header[1:]):
+        print(f"▶ {column}")
+        print(f"{'part':<28}{'count':>8}{'mean':>10}{'min':>10}{'max':>10}{'std':>10}")
+        for i, name in enumerate(stats["names"]):
+            print(f"{name:<28}{int(stats['count'][i, j]):>8}{stats['mean'][i, j]:>10.3f}"
+                  f"{stats['min'][i, j]:>10.3f}{stats['max'][i, j]:>10.3f}{std[i, j]:>10.3f}")
+
+
+if __name__ == "__main__":
+    # mars_base_main_parts-NNN.csv 파일을 모두 처리 (없으면 기본 3개 파일)
+    files = sorted(glob.glob(os.path.join(base_dir, "mars_base_main_parts-*.csv")))
+    files = files or [file1, file2, file3]
+
+    # 결과 저장
+    output_path = "D:/SW CAMP with Codyssey/C01/P05/parts_to_work_on.csv"
+    cache_dir = os.path.join(base_dir, "parts_cache")
+    names, parts2 = np.array([], dtype=str), np.empty((0, 0))
+    try:
+        # 청크 단위로 읽으면서 평균값 계산 + 평균값이 50 미만인 행 저장
+        # (원본 파일이 그대로면 캐시를 mmap 으로 열기만 함)
+        names, parts2, mean_values, cached = load_merged_parts(files, output_path, cache_dir)
+        print(f"📊 열 평균값: {np.round(mean_values, 3)}")
+        if cached:
+            print(f"✅ 원본 변경 없음 → 캐시 사용: {cache_dir}")
+        else:
+            print(f"✅ parts_to_work_on.csv 저장 완료: {output_path}")
+    except Exception as e:
+        print(f"❌ 저장 중 오류 발생: {e}")
+
+    # 🎁 보너스 과제
+    try:
+        parts3 = parts2.T  # 전치행렬
+        print("📐 전치 행렬:")
+        print(names)
+        print(np.round(parts3, 3))
+    except Exception as e:
+        print(f"❌ 보너스 과제 수행 중 오류 발생: {e}")
+
+    # 📊 부품별 강도 통계 (새 파일만 추가 집계)
+    try:
+        stats_path = os.path.join(base_dir, "part_stats.npz")
+        stats = update_part_stats(files, stats_path)
+        if stats is not None:
+            with open(files[0], "r", encoding="utf-8-sig") as f:
+                header = read_part_header(f)
+            print("📊 부품별 통계:")
+            print_part_stats(stats, header)
+    except Exception as e:
+        print(f"❌ 부품별 통계 계산 중 오류 발생: {e}")
@@ -1,8 +1,68 @@
 import random
 import datetime
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+# 센서별 (최솟값, 최댓값, 반올림 자릿수)
+SENSOR_RANGES = {
+    "mars_base_internal_temperature": (18, 30, 2),
+    "mars_base_external_temperature": (0, 21, 2),
+    "mars_base_internal_humidity": (50, 60, 2),
+    "mars_base_external_illuminance": (500, 715, 2),
+    "mars_base_internal_co2": (0.02, 0.1, 4),
+    "mars_base_internal_oxygen": (4.0, 7.0, 2)
+}
+
+LOG_FORMAT = "%s, %s°C, %s°C, %s%%, %sW/m², %s%%, %s%%\n"
+
+
+class BufferedLogWriter:
+    # 파일을 한 번만 열어 두고, 일정 크기나 시간이 지나면 모아서 기록하는 로그 작성기
+    def __init__(self, path="env_log.txt", flush_interval=1.0, flush_size=256 * 1024):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.file = open(path, "a", encoding="utf-8")
+        self.buffer = []
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if (self.buffered >= self.flush_size
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def write_lines(self, lines):
+        self.write("".join(lines))
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, log_writer=None, telemetry=None):
         self.env_values = {
             "mars_base_internal_temperature": 0.0,
             "mars_base_external_temperature": 0.0,
@@ -11,14 +71,15 @@ class DummySensor:
             "mars_base_internal_co2": 0.0,
             "mars_base_internal_oxygen": 0.0
         }
+        # log_writer 가 있으면 매번 파일을 열고 닫지 않고 버퍼에 모아서 기록
+        self.log_writer = log_writer
+        # telemetry(TelemetryRingBuffer)가 있으면 측정값을 바이너리로도 저장
+        self.telemetry = telemetry
 
     def set_env(self):
-        self.env_values["mars_base_internal_temperature"] = round(random.uniform(18, 30), 2)
-        self.env_values["mars_base_external_temperature"] = round(random.uniform(0, 21), 2)
-        self.env_values["mars_base_internal_humidity"] = round(random.uniform(50, 60), 2)
-        self.env_values["mars_base_external_illuminance"] = round(random.uniform(500, 715), 2)
-        self.env_values["mars_base_internal_co2"] = round(random.uniform(0.02, 0.1), 4)
-        self.env_values["mars_base_internal_oxygen"] = round(random.uniform(4.0, 7.0), 2)
+        # 범위와 반올림 자릿수는 sample_batch() 와 같은 SENSOR_RANGES 를 사용
+        for key, (low, high, digits) in SENSOR_RANGES.items():
+            self.env_values[key] = round(random.uniform(low, high), digits)
 
     def get_env(self):
         # 로그 파일에 기록
@@ -33,13 +94,222 @@ class DummySensor:
             f"{self.env_values['mars_base_internal_oxygen']}%\n"
         )
         try:
-            with open("env_log.txt", "a", encoding="utf-8") as file:
-                file.write(log_line)
+            if self.log_writer is not None:
+                self.log_writer.write(log_line)
+            else:
+                with open("env_log.txt", "a", encoding="utf-8") as file:
+                    file.write(log_line)
         except Exception as e:
             print("❌ 로그 파일 저장 중 오류 발생:", e)
 
+        if self.telemetry is not None:
+            self.telemetry.append(time.time(), self.env_values)
+
         return self.env_values
 
+    # ⚡ 고속 샘플링: n개의 측정값을 한 번에 생성
+    def sample_batch(self, n, rng=None, start_time=None, rate=None):
+        """n개의 측정값을 NumPy 로 한 번에 만든다.
+
+        반환값: {"timestamp": epoch 초 배열, 센서 키: 값 배열, ...}
+        rate 가 주어지면 start_time 부터 1/rate 초 간격, 아니면 모두 현재 시각.
+        마지막 측정값은 env_values 에도 반영한다.
+        """
+        rng = rng or np.random.default_rng()
+        start_time = time.time() if start_time is None else start_time
+        if rate:
+            timestamps = start_time + np.arange(n) / rate
+        else:
+            timestamps = np.full(n, start_time)
+
+        batch = {"timestamp": timestamps}
+        for key, (low, high, digits) in SENSOR_RANGES.items():
+            batch[key] = np.round(rng.uniform(low, high, n), digits)
+        if n:
+            for key in SENSOR_RANGES:
+                self.env_values[key] = float(batch[key][-1])
+        return batch
+
+    def log_batch(self, batch):
+        # 측정값 묶음을 기존 env_log.txt 형식으로 기록
+        seconds = batch["timestamp"].astype(np.int64)
+        labels = {}
+        for second in np.unique(seconds).tolist():
+            labels[second] = datetime.datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+        columns = [batch[key].tolist() for key in SENSOR_RANGES]
+        lines = [
+            LOG_FORMAT % ((labels[second],) + values)
+            for second, values in zip(seconds.tolist(), zip(*columns))
+        ]
+        try:
+            if self.log_writer is not None:
+                self.log_writer.write_lines(lines)
+            else:
+                with open("env_log.txt", "a", encoding="utf-8") as file:
+                    file.writelines(lines)
+        except Exception as e:
+            print("❌ 로그 파일 저장 중 오류 발생:", e)
+
+        if self.telemetry is not None:
+            self.telemetry.append_batch(batch)
+
+
+# ----------------------------------------
+# 💾 바이너리 링 버퍼 텔레메트리 저장소
+# ----------------------------------------
+# [헤더 64B] magic, version, 용량, 다음 기록 위치, 저장된 개수
+# [레코드 x 용량] timestamp(float64) + 센서 6개(float32) = 32B 고정 길이
+# 용량이 차면 가장 오래된 레코드부터 덮어쓰므로 파일 크기가 일정하다.
+
+RING_MAGIC = b"MTRB"
+RING_VERSION = 1
+RING_HEADER = struct.Struct("<4sIQQQ")
+RING_HEADER_SIZE = 64
+TELEMETRY_DTYPE = np.dtype(
+    [("timestamp", "<f8")] + [(key, "<f4") for key in SENSOR_RANGES]
+)
+
+
+class TelemetryRingBuffer:
+    """mmap 기반 고정 크기 텔레메트리 저장소.
+
+    capacity 개까지 보관하며, window() / latest() 는 파일을 파싱하지 않고
+    NumPy 구조화 배열로 돌려준다 (링이 한 바퀴 돌아 끊긴 구간만 복사본).
+    """
+
+    def __init__(self, path="env_telemetry.bin", capacity=None, readonly=False):
+        exists = os.path.exists(path)
+        if not exists:
+            if readonly or capacity is None:
+                raise FileNotFoundError(path)
+            with open(path, "wb") as f:
+                f.write(RING_HEADER.pack(RING_MAGIC, RING_VERSION, capacity, 0, 0)
+                        .ljust(RING_HEADER_SIZE, b"\0"))
+                f.truncate(RING_HEADER_SIZE + capacity * TELEMETRY_DTYPE.itemsize)
+
+        self.path = path
+        self.readonly = readonly
+        self.file = open(path, "rb" if readonly else "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0,
+                             access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+        magic, version, stored_capacity, _, _ = RING_HEADER.unpack_from(self.map, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self.close()
+            raise ValueError("텔레메트리 파일 형식이 아닙니다.")
+        self.capacity = stored_capacity
+        self.records = np.ndarray((self.capacity,), dtype=TELEMETRY_DTYPE,
+                                  buffer=self.map, offset=RING_HEADER_SIZE)
+
+    @staticmethod
+    def capacity_for(retention_seconds, rate):
+        # 보관 기간(초) x 초당 샘플 수
+        return int(retention_seconds * rate)
+
+    def _state(self):
+        _, _, _, head, count = RING_HEADER.unpack_from(self.map, 0)
+        return head, count
+
+    def _set_state(self, head, count):
+        RING_HEADER.pack_into(self.map, 0, RING_MAGIC, RING_VERSION, self.capacity, head, count)
+
+    def append_batch(self, batch):
+        """sample_batch() 결과(또는 같은 키의 배열 dict)를 기록한다."""
+        n = len(batch["timestamp"])
+        if n > self.capacity:
+            # 용량보다 많으면 마지막 capacity 개만 남음
+            batch = {key: values[-self.capacity:] for key, values in batch.items()}
+            n = self.capacity
+        head, count = self._state()
+        first = min(n, self.capacity - head)
+        for key in TELEMETRY_DTYPE.names:
+            values = np.asarray(batch[key])
+            self.records[key][head:head + first] = values[:first]
+            self.records[key][:n - first] = values[first:]
+        # 데이터를 먼저 쓰고 헤더를 나중에 갱신 (읽는 쪽은 헤더 기준으로만 읽음)
+        self._set_state((head + n) % self.capacity, min(count + n, self.capacity))
+
+    def append(self, timestamp, env_values):
+        batch = {key: [env_values[key]] for key in SENSOR_RANGES}
+        batch["timestamp"] = [timestamp]
+        self.append_batch(batch)
+
+    def _segments(self):
+        # 오래된 순서의 연속 구간 목록
+        head, count = self._state()
+        if count < self.capacity:
+            return [self.records[:count]]
+        return [self.records[head:], self.records[:head]]
+
+    def window(self, start, end):
+        """start <= timestamp < end 인 레코드를 시간순 구조화 배열로 반환한다."""
+        parts = []
+        for segment in self._segments():
+            timestamps = segment["timestamp"]
+            lo = np.searchsorted(timestamps, start, side="left")
+            hi = np.searchsorted(timestamps, end, side="left")
+            if lo < hi:
+                parts.append(segment[lo:hi])
+        if not parts:
+            return self.records[:0]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def latest(self, n):
+        """가장 최근 n개 레코드를 시간순으로 반환한다."""
+        segments = self._segments()
+        if len(segments) == 2 and n <= len(segments[1]):
+            return segments[1][len(segments[1]) - n:]
+        data = segments[0] if len(segments) == 1 else np.concatenate(segments)
+        return data[max(len(data) - n, 0):]
+
+    def __len__(self):
+        return self._state()[1]
+
+    def flush(self):
+        if not self.readonly:
+            self.map.flush()
+
+    def close(self):
+        if getattr(self, "records", None) is not None:
+            self.flush()
+            self.records = None
+        if not self.map.closed:
+            try:
+                self.map.close()
+            except BufferError:
+                # 밖에서 아직 window()/latest() 결과를 쓰는 중이면 mmap 은 GC 에 맡김
+                pass
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_high_rate(rate=100000, duration=1.0, batch_size=10000,
+                  log_path="env_log.txt", flush_interval=1.0, flush_size=256 * 1024):
+    """초당 rate 개의 측정값을 batch_size 개씩 생성·기록한다. 실제 처리 속도(개/초)를 반환."""
+    total = int(rate * duration)
+    produced = 0
+    with BufferedLogWriter(log_path, flush_interval, flush_size) as writer:
+        ds = DummySensor(log_writer=writer)
+        rng = np.random.default_rng()
+        start = time.time()
+        while produced < total:
+            n = min(batch_size, total - produced)
+            batch = ds.sample_batch(n, rng, start + produced / rate, rate)
+            ds.log_batch(batch)
+            produced += n
+
+            # 목표 속도보다 빠르면 다음 묶음 시각까지 대기
+            wait = start + produced / rate - time.time()
+            if wait > 0:
+                time.sleep(wait)
+        elapsed = time.time() - start
+    return produced / elapsed if elapsed > 0 else float("inf")
+
+
 # 인스턴스 생성 및 사용
 if __name__ == "__main__":
     ds = DummySensor()
@@ -49,4 +319,4 @@ if __name__ == "__main__":
     # 콘솔 출력
     print("▶ 현재 환경 센서 값:")
     for key, value in env.items():
-        print(f"{key}: {value}")
\ No newline at end of file
+        print(f"{key}: {value}")
@@ -1,9 +1,559 @@
+import os
+import sys
+import abc
+import math
 import time
 import json
-from mars_mission_computer import DummySensor
+import queue
+import socket
+import datetime
+import threading
+from collections import deque
+from mars_mission_computer import DummySensor, SENSOR_RANGES, TelemetryRingBuffer
+
+# ----------------------------------------
+# 📉 롤업 단계 (1초 / 1분 / 1시간 집계)
+# ----------------------------------------
+# 측정값이 들어올 때마다 각 단계의 현재 구간(bucket)에 min/max/합계/개수를 누적한다.
+# 단계마다 보관할 구간 수가 정해져 있어 장기 임무에도 메모리 사용량이 일정하다.
+
+# (구간 길이(초), 보관할 구간 수): 1초 x 1시간, 1분 x 7일, 1시간 x 30일
+ROLLUP_TIERS = ((1, 3600), (60, 7 * 24 * 60), (3600, 30 * 24))
+
+
+class RollupTier:
+    def __init__(self, bucket_seconds, retention):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque(maxlen=retention)  # 닫힌 구간 (오래된 순)
+        self.current = None
+        self.evicted = False  # 보관 한도를 넘어 버린 구간이 있는지
+
+    def _new_bucket(self, start, values):
+        return {
+            "start": start,
+            "count": 1,
+            "stats": {key: [value, value, value] for key, value in values.items()}  # min, max, sum
+        }
+
+    def add(self, timestamp, values):
+        start = timestamp - timestamp % self.bucket_seconds
+        current = self.current
+        if current is None or start > current["start"]:
+            if current is not None:
+                if len(self.buckets) == self.buckets.maxlen:
+                    self.evicted = True
+                self.buckets.append(current)
+            self.current = self._new_bucket(start, values)
+            return
+        if start < current["start"]:
+            return  # 이미 닫힌 구간의 늦게 도착한 값은 무시
+        current["count"] += 1
+        for key, value in values.items():
+            stat = current["stats"][key]
+            if value < stat[0]:
+                stat[0] = value
+            if value > stat[1]:
+                stat[1] = value
+            stat[2] += value
+
+    def query(self, start, end):
+        """[start, end) 와 겹치는 구간을 {start, count, key: {min, max, mean}} 목록으로 반환."""
+        buckets = list(self.buckets)
+        if self.current is not None:
+            buckets.append(self.current)
+        result = []
+        for bucket in buckets:
+            if bucket["start"] < end and bucket["start"] + self.bucket_seconds > start:
+                row = {"start": bucket["start"], "count": bucket["count"]}
+                for key, (low, high, total) in bucket["stats"].items():
+                    row[key] = {"min": low, "max": high, "mean": total / bucket["count"]}
+                result.append(row)
+        return result
+
+    def oldest(self):
+        if self.buckets:
+            return self.buckets[0]["start"]
+        return self.current["start"] if self.current else None
+
+    def covers(self, start):
+        # 버린 구간이 없으면 처음부터 모든 값을 보관하고 있으므로 항상 충분함
+        if not self.evicted:
+            return True
+        oldest = self.oldest()
+        return oldest is not None and oldest <= start
+
+
+class TelemetryRollup:
+    def __init__(self, tiers=ROLLUP_TIERS):
+        self.tiers = [RollupTier(seconds, retention) for seconds, retention in tiers]
+
+    def add(self, timestamp, env_values):
+        values = {key: value for key, value in env_values.items() if value is not None}
+        for tier in self.tiers:
+            tier.add(timestamp, values)
+
+    def query(self, start, end, resolution=None):
+        """구간 [start, end) 의 집계 결과를 반환한다.
+
+        resolution(초) 이상인 단계 중 start 이후의 데이터를 버리지 않은 가장 세밀한
+        단계를 사용한다 (resolution 이 없으면 모든 단계가 후보).
+        """
+        for tier in self.tiers:
+            if resolution is not None and tier.bucket_seconds < resolution:
+                continue
+            if tier.covers(start):
+                return tier.bucket_seconds, tier.query(start, end)
+        tier = self.tiers[-1]
+        return tier.bucket_seconds, tier.query(start, end)
+
+# ----------------------------------------
+# 🔌 센서 소스 (실시간 센서 / 기록 재생)
+# ----------------------------------------
+# 소스는 (timestamp, env_values) 를 순서대로 내보내는 반복 가능한 객체이다.
+# 측정 간격만큼 기다리는 것도 소스가 맡으므로, MissionComputer 는 실시간 센서와
+# 기록 재생을 구분하지 않고 같은 파이프라인(롤업, 출력)으로 처리한다.
+
+
+class SensorSource(abc.ABC):
+    """센서 소스 기본 클래스. 하위 클래스는 readings() 를 구현한다."""
+
+    @abc.abstractmethod
+    def readings(self):
+        """(timestamp, env_values) 를 차례로 내주는 이터레이터를 돌려준다."""
+
+    def __iter__(self):
+        return self.readings()
+
+
+class DummySensorSource(SensorSource):
+    """DummySensor 를 interval 초마다 읽는 실시간 소스 (기존 동작).
+
+    interval=0 이면 기다리지 않고 계속 읽는다 (벤치마크용).
+    """
+
+    def __init__(self, sensor=None, interval=5):
+        self.sensor = sensor or DummySensor()
+        self.interval = interval
+
+    def readings(self):
+        while True:
+            self.sensor.set_env()
+            yield time.time(), self.sensor.get_env()
+            if self.interval:
+                time.sleep(self.interval)
+
+
+def parse_env_log_line(line):
+    """env_log.txt 한 줄을 (timestamp, env_values) 로 바꾼다. 형식이 다르면 None."""
+    parts = line.rstrip("\r\n").split(", ")
+    if len(parts) != len(SENSOR_RANGES) + 1:
+        return None
+    try:
+        timestamp = datetime.datetime.fromisoformat(parts[0]).timestamp()
+        values = {
+            key: float(text.rstrip("°C%W/m²"))
+            for key, text in zip(SENSOR_RANGES, parts[1:])
+        }
+    except ValueError:
+        return None
+    return timestamp, values
+
+
+class ReplaySource(SensorSource):
+    """기록된 env_log.txt 또는 텔레메트리 바이너리(.bin)를 다시 재생하는 소스.
+
+    speed 가 None 이면 기다리지 않고 최대한 빠르게, 숫자면 기록된 시간 간격을
+    speed 배 빠르게 재현한다 (speed=60 이면 1시간 기록을 1분에 재생).
+    """
+
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+        self.skipped = 0  # 형식이 맞지 않아 건너뛴 줄 수
+
+    def _records(self):
+        if self.path.endswith(".bin"):
+            yield from self._binary_records()
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                record = parse_env_log_line(line)
+                if record is None:
+                    if line.strip():
+                        self.skipped += 1
+                    continue
+                yield record
+
+    def _binary_records(self):
+        with TelemetryRingBuffer(self.path, readonly=True) as telemetry:
+            data = telemetry.latest(len(telemetry))
+            columns = [
+                (key, data[key].astype(float).round(digits).tolist())
+                for key, (_, _, digits) in SENSOR_RANGES.items()
+            ]
+            timestamps = data["timestamp"].tolist()
+            del data
+        for i, timestamp in enumerate(timestamps):
+            yield timestamp, {key: values[i] for key, values in columns}
+
+    def readings(self):
+        speed = self.speed
+        first = None
+        started = time.monotonic()
+        for timestamp, values in self._records():
+            if speed:
+                if first is None:
+                    first = timestamp
+                delay = started + (timestamp - first) / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            yield timestamp, values
+
+
+# ----------------------------------------
+# 🚨 경보 규칙 엔진
+# ----------------------------------------
+# 규칙은 센서 키별로 미리 묶어 두고(컴파일), 측정값 하나가 들어올 때마다
+# 해당 키의 규칙만 상태를 조금씩 갱신하며 평가한다. 지난 기록을 다시 훑지 않으므로
+# 측정값 하나당 O(1) (변화율 규칙은 분할 상환 O(1)) 이다.
+# 경보는 조건이 거짓 → 참으로 바뀌는 순간 한 번만 발생하고, 다시 거짓이 되면 해제된다.
+
+
+class AlertRule(abc.ABC):
+    """규칙 기본 클래스. check() 는 현재 조건이 성립하는지 반환한다."""
+
+    def __init__(self, key, name=None):
+        self.key = key
+        self.name = name or key
+        self.active = False
+
+    @abc.abstractmethod
+    def check(self, timestamp, value):
+        """timestamp 시점의 value 로 조건이 성립하면 True 를 돌려준다."""
+
+
+class ThresholdRule(AlertRule):
+    """값이 above 보다 크거나 below 보다 작으면 성립."""
+
+    def __init__(self, key, above=None, below=None, name=None):
+        super().__init__(key, name)
+        self.above = float("inf") if above is None else above
+        self.below = float("-inf") if below is None else below
+
+    def check(self, timestamp, value):
+        return value > self.above or value < self.below
+
+
+class RateOfChangeRule(AlertRule):
+    """최근 window 초 안에서 값이 max_change 보다 크게 변하면 성립."""
+
+    def __init__(self, key, max_change, window, name=None):
+        super().__init__(key, name)
+        self.max_change = max_change
+        self.window = window
+        self.history = deque()  # window 안의 (timestamp, value)
+
+    def check(self, timestamp, value):
+        history = self.history
+        history.append((timestamp, value))
+        limit = timestamp - self.window
+        while history[0][0] < limit:
+            history.popleft()
+        return abs(value - history[0][1]) > self.max_change
+
+
+class SustainedRule(AlertRule):
+    """다른 규칙의 조건이 seconds 초 이상 계속 성립하면 성립."""
+
+    def __init__(self, rule, seconds, name=None):
+        super().__init__(rule.key, name or f"{rule.name} ({seconds}초 지속)")
+        self.rule = rule
+        self.seconds = seconds
+        self.since = None  # 조건이 성립하기 시작한 시각
+
+    def check(self, timestamp, value):
+        if not self.rule.check(timestamp, value):
+            self.since = None
+            return False
+        if self.since is None:
+            self.since = timestamp
+        return timestamp - self.since >= self.seconds
+
+
+def default_alert_rules():
+    # 기본 규칙 묶음 (MissionComputer(alert_rules=default_alert_rules()) 로 켬)
+    # 기준값은 DummySensor 의 정상 범위(SENSOR_RANGES) 바깥에 두어 정상 측정값으로는 울리지 않음
+    # 규칙 객체는 상태를 가지므로 MissionComputer 마다 새로 만든다
+    return [
+        ThresholdRule('mars_base_internal_oxygen', below=4.0, name='산소 부족'),
+        SustainedRule(ThresholdRule('mars_base_internal_co2', above=0.1,
+                                    name='이산화탄소 과다'), 30),
+        ThresholdRule('mars_base_internal_temperature', above=30, below=18, name='내부 온도 이상'),
+        RateOfChangeRule('mars_base_internal_temperature', 12, 10, name='내부 온도 급변'),
+    ]
+
+
+class AlertEngine:
+    def __init__(self, rules=None, on_alert=None, history=1000):
+        self.rules_by_key = {}
+        for rule in rules or ():
+            self.rules_by_key.setdefault(rule.key, []).append(rule)
+        self.on_alert = on_alert
+        self.history = deque(maxlen=history)  # 최근 경보 기록
+        self.fired = 0  # 지금까지 발생한 경보 수
+
+    def evaluate(self, timestamp, env_values):
+        """측정값 하나를 평가해 새로 발생한 경보 목록을 반환한다."""
+        alerts = []
+        for key, rules in self.rules_by_key.items():
+            value = env_values.get(key)
+            if value is None:
+                continue
+            for rule in rules:
+                active = rule.check(timestamp, value)
+                if active == rule.active:
+                    continue
+                rule.active = active
+                if active:
+                    alert = {"timestamp": timestamp, "rule": rule.name, "key": key, "value": value}
+                    alerts.append(alert)
+                    self.history.append(alert)
+                    self.fired += 1
+                    if self.on_alert is not None:
+                        self.on_alert(alert)
+        return alerts
+
+    def active(self):
+        # 현재 성립 중인 규칙 이름 목록
+        return [rule.name for rules in self.rules_by_key.values() for rule in rules if rule.active]
+
+
+# ----------------------------------------
+# 📤 텔레메트리 출력 계층 (압축 JSON + 비동기 싱크)
+# ----------------------------------------
+# emit() 은 레코드를 큐에 넣기만 하고 바로 돌아온다. 직렬화와 출력은 백그라운드
+# 스레드가 묶음 단위로 처리하므로 측정 루프가 콘솔 / 파일 / 소켓 I/O 를 기다리지 않는다.
+# 큐가 가득 차면 측정 루프를 막는 대신 레코드를 버리고 dropped 로 센다.
+# 같은 키 구성의 레코드는 '"키":' 조각을 한 번만 만들어 두고 값만 이어 붙인다.
+
+_encode_string = json.encoder.encode_basestring
+
+
+def _encode_value(value):
+    kind = type(value)
+    if kind is float:
+        return float.__repr__(value) if math.isfinite(value) else json.dumps(value)
+    if kind is int:
+        return int.__repr__(value)
+    if kind is str:
+        return _encode_string(value)
+    if value is None:
+        return "null"
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class CompactEncoder:
+    """dict 레코드를 공백 없는 한 줄 JSON 으로 바꾼다 (키 구성별 조각 캐시)."""
 
-class MissionComputer:
     def __init__(self):
+        self._prefixes = {}
+
+    def encode(self, record):
+        keys = tuple(record)
+        prefixes = self._prefixes.get(keys)
+        if prefixes is None:
+            prefixes = self._prefixes[keys] = [
+                ("{" if i == 0 else ",") + _encode_string(key) + ":"
+                for i, key in enumerate(keys)
+            ]
+        parts = []
+        for prefix, value in zip(prefixes, record.values()):
+            parts.append(prefix)
+            parts.append(_encode_value(value))
+        parts.append("}")
+        return "".join(parts)
+
+
+class ConsoleSink:
+    """사람이 읽기 좋은 들여쓰기 JSON 을 콘솔에 출력 (기존 출력 형식)."""
+
+    def write_batch(self, items):
+        print("\n".join(json.dumps(record, ensure_ascii=False, indent=4) for record, _ in items))
+
+    def close(self):
+        pass
+
+
+class NdjsonSink:
+    """한 줄에 레코드 하나씩 (NDJSON) stream 에 기록. 기본은 표준 출력."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write_batch(self, items):
+        self.stream.write("".join(line + "\n" for _, line in items))
+        self.stream.flush()
+
+    def close(self):
+        self.stream.flush()
+
+
+class RotatingFileSink:
+    """NDJSON 파일에 기록하고 max_bytes 를 넘으면 path.1, path.2 ... 로 돌려 쓴다."""
+
+    def __init__(self, path="env_telemetry.ndjson", max_bytes=10 * 1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.size = 0
+
+    def write_batch(self, items):
+        chunk = []
+        for _, line in items:
+            line += "\n"
+            size = len(line.encode("utf-8"))
+            if self.size and self.size + size > self.max_bytes:
+                self.file.writelines(chunk)
+                chunk = []
+                self._rotate()
+            chunk.append(line)
+            self.size += size
+        self.file.writelines(chunk)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class UnixSocketSink:
+    """Unix 도메인 소켓으로 NDJSON 을 보낸다. 연결이 끊기면 retry_interval 후 다시 연결."""
+
+    def __init__(self, path, retry_interval=1.0):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix 소켓을 지원하지 않는 환경입니다.")
+        self.path = path
+        self.retry_interval = retry_interval
+        self.sock = None
+        self.retry_at = 0.0
+        self.dropped = 0  # 연결이 없어 보내지 못한 레코드 수
+
+    def _disconnect(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        self.retry_at = time.monotonic() + self.retry_interval
+
+    def write_batch(self, items):
+        if self.sock is None:
+            if time.monotonic() < self.retry_at:
+                self.dropped += len(items)
+                return
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                self._disconnect()
+                self.dropped += len(items)
+                return
+            self.sock = sock
+        try:
+            self.sock.sendall("".join(line + "\n" for _, line in items).encode("utf-8"))
+        except OSError:
+            self._disconnect()
+            self.dropped += len(items)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+def make_sink(spec):
+    """'console', 'ndjson', 'file:경로', 'unix:경로' 형식의 문자열로 싱크를 만든다."""
+    kind, _, target = spec.partition(":")
+    if kind == "console":
+        return ConsoleSink()
+    if kind == "ndjson":
+        return NdjsonSink()
+    if kind == "file":
+        return RotatingFileSink(target or "env_telemetry.ndjson")
+    if kind == "unix":
+        return UnixSocketSink(target)
+    raise ValueError(f"알 수 없는 출력 형식입니다: {spec}")
+
+
+_STOP = object()
+
+
+class TelemetryOutput:
+    def __init__(self, sinks, queue_size=10000, batch_size=256):
+        self.sinks = list(sinks)
+        self.encoder = CompactEncoder()
+        self.queue = queue.Queue(queue_size)
+        self.batch_size = batch_size
+        self.dropped = 0  # 큐가 가득 차 버린 레코드 수
+        self.errors = 0   # 싱크 기록 중 발생한 오류 수
+        self.thread = threading.Thread(target=self._run, name="TelemetryOutput", daemon=True)
+        self.thread.start()
+
+    def emit(self, kind, data, timestamp=None):
+        """레코드를 큐에 넣고 바로 반환한다 (data 는 얕은 복사해 둠)."""
+        record = {"type": kind, "timestamp": time.time() if timestamp is None else timestamp}
+        record.update(data)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            items = [(record, self.encoder.encode(record)) for record in batch if record is not _STOP]
+            if items:
+                for sink in self.sinks:
+                    try:
+                        sink.write_batch(items)
+                    except Exception as e:
+                        self.errors += 1
+                        print("❌ 텔레메트리 출력 중 오류 발생:", e, file=sys.stderr)
+            if stop:
+                return
+
+    def close(self):
+        # 큐에 남은 레코드를 모두 내보낸 뒤 싱크를 닫음
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MissionComputer:
+    def __init__(self, source=None, alert_rules=None, output=None):
         self.env_values = {
             'mars_base_internal_temperature': None,      
             'mars_base_external_temperature': None,      
@@ -13,17 +563,64 @@ class MissionComputer:
             'mars_base_internal_oxygen': None            
         }
         
-        self.ds = DummySensor()
+        # source 가 없으면 DummySensor 를 5초마다 읽는 기존 동작
+        self.source = source or DummySensorSource()
+        self.ds = getattr(self.source, "sensor", None)
+        self.rollup = TelemetryRollup()
+        # 경보 규칙은 지정한 경우에만 평가 (없으면 경보 없음)
+        self.alerts = AlertEngine(alert_rules)
+        # output(TelemetryOutput)이 있으면 콘솔 출력 대신 비동기 출력 계층으로 내보냄
+        self.output = output
         
 
-    def get_sensor_data(self):
-       
-        while True:
-            self.ds.set_env()
-            self.env_values = self.ds.get_env()        
-            print(json.dumps(self.env_values, ensure_ascii=False, indent=4))
-            time.sleep(5)
+    def get_sensor_data(self, limit=None, verbose=True):
+        """소스가 끝나거나 limit 개를 처리할 때까지 측정값을 처리하고 처리한 개수를 반환한다."""
+        count = 0
+        for timestamp, values in self.source:
+            self.env_values = values
+            self.rollup.add(timestamp, self.env_values)
+            alerts = self.alerts.evaluate(timestamp, self.env_values)
+            if self.output is not None:
+                self.output.emit("sensor", self.env_values, timestamp)
+                for alert in alerts:
+                    self.output.emit("alert", alert, timestamp)
+            elif verbose:
+                print(json.dumps(self.env_values, ensure_ascii=False, indent=4))
+                for alert in alerts:
+                    print(f"⚠️ 경보: {alert['rule']} ({alert['key']} = {alert['value']})")
+            count += 1
+            if limit is not None and count >= limit:
+                break
+        return count
          
+# python mars_mission_computer2.py --replay env_log.txt [--speed N]
+#   기록을 재생해 파이프라인을 통과시킨다 (--speed 없으면 최대 속도)
+# python mars_mission_computer2.py --output ndjson,file:env_telemetry.ndjson
+#   콘솔 출력 대신 출력 계층으로 내보낸다 (console / ndjson / file:경로 / unix:경로)
+# python mars_mission_computer2.py --alerts
+#   기본 경보 규칙(default_alert_rules)을 켠다
 if __name__ == "__main__":
-    RunComputer = MissionComputer()
-    RunComputer.get_sensor_data()
\ No newline at end of file
+    output = None
+    alert_rules = default_alert_rules() if "--alerts" in sys.argv else None
+    if "--output" in sys.argv:
+        specs = sys.argv[sys.argv.index("--output") + 1].split(",")
+        output = TelemetryOutput([make_sink(spec) for spec in specs])
+    try:
+        if "--replay" in sys.argv:
+            path = sys.argv[sys.argv.index("--replay") + 1]
+            speed = None
+            if "--speed" in sys.argv:
+                speed = float(sys.argv[sys.argv.index("--speed") + 1])
+            source = ReplaySource(path, speed)
+            RunComputer = MissionComputer(source, alert_rules, output)
+            started = time.perf_counter()
+            count = RunComputer.get_sensor_data(verbose=speed is not None)
+            elapsed = time.perf_counter() - started
+            print(f"✅ {count}개 측정값 재생 완료 ({elapsed:.3f}초, 건너뛴 줄 {source.skipped}개, "
+                  f"경보 {RunComputer.alerts.fired}개)", file=sys.stderr if output else sys.stdout)
+        else:
+            RunComputer = MissionComputer(alert_rules=alert_rules, output=output)
+            RunComputer.get_sensor_data()
+    finally:
+        if output is not None:
+            output.close()
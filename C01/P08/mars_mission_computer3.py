@@ -1,39 +1,249 @@
 import platform
 import psutil
 import json
-from mars_mission_computer2 import MissionComputer
+import math
+import sys
+import threading
+import time
+from collections import deque
+from mars_mission_computer2 import MissionComputer, TelemetryOutput, make_sink
+
+
+# ----------------------------------------
+# ⏱ 백그라운드 부하 측정기
+# ----------------------------------------
+# psutil.cpu_percent(interval=1) 은 호출할 때마다 1초를 기다린다.
+# 별도 스레드가 interval 마다 측정해서 최근 window 개를 보관하고,
+# 조회는 보관된 값을 바로 돌려준다.
+
+def percentile(values, p):
+    # 최근접 순위 방식 백분위수
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LoadSampler:
+    PERCENTILES = (50, 90, 99)
+    MIN_CPU_INTERVAL = 0.1  # 기준점을 잡은 뒤 이만큼은 지나야 의미 있는 CPU 값이 나옴
+
+    def __init__(self, interval=1.0, window=60):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        # cpu_percent(interval=None) 의 첫 호출은 0.0 만 돌려주고 기준점만 잡으므로
+        # 생성할 때 한 번 호출해 둠
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self.last_disk = self._disk_counters()
+        self.last_time = time.monotonic()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _disk_counters(self):
+        try:
+            return psutil.disk_io_counters()
+        except Exception:
+            return None  # 디스크 통계를 지원하지 않는 환경
+
+    def sample(self):
+        """지금 한 번 측정해서 보관한다.
+
+        직전 측정(또는 기준점)에서 MIN_CPU_INTERVAL 이 지나지 않았으면
+        남은 시간만큼 기다린 뒤 측정한다.
+        """
+        wait = self.MIN_CPU_INTERVAL - (time.monotonic() - self.last_time)
+        if wait > 0:
+            time.sleep(wait)
+        now = time.monotonic()
+        disk = self._disk_counters()
+        elapsed = now - self.last_time if self.last_time else 0
+        read_rate = write_rate = 0.0
+        if disk is not None and self.last_disk is not None and elapsed > 0:
+            read_rate = (disk.read_bytes - self.last_disk.read_bytes) / elapsed
+            write_rate = (disk.write_bytes - self.last_disk.write_bytes) / elapsed
+        self.last_disk, self.last_time = disk, now
+
+        snapshot = {
+            "time": time.time(),
+            "cpu": psutil.cpu_percent(interval=None),
+            "per_core": psutil.cpu_percent(interval=None, percpu=True),
+            "memory": psutil.virtual_memory().percent,
+            "disk_read": read_rate,
+            "disk_write": write_rate
+        }
+        with self.lock:
+            self.samples.append(snapshot)
+        return snapshot
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"❌ 부하 측정 중 오류 발생: {e}")
+
+    def latest(self):
+        with self.lock:
+            return self.samples[-1] if self.samples else None
+
+    def window_stats(self, key):
+        # 보관 구간의 백분위수 {p50, p90, p99}
+        with self.lock:
+            values = [s[key] for s in self.samples]
+        return {f"p{p}": percentile(values, p) for p in self.PERCENTILES}
+
+
+# ----------------------------------------
+# 🗂 정적 시스템 정보 캐시
+# ----------------------------------------
+# 운영체계 / CPU 정보는 실행 중에 바뀌지 않으므로 처음 필요할 때 한 번만 조회한다.
+# (platform.processor(), platform.version() 은 일부 리눅스에서 꽤 느림)
+# 메모리 크기처럼 바뀔 수 있는 값만 VOLATILE_TTL 초가 지나면 새로 읽는다.
+
+VOLATILE_TTL = 5.0
+
+_static_info = None
+_static_info_lock = threading.Lock()
+_volatile_info = None
+_volatile_time = 0.0
+
+
+def _probe_static_info():
+    return {
+        "운영체계": platform.system(),
+        "운영체계 버전": platform.version(),
+        "CPU 타입": platform.processor(),
+        "CPU 코어수": psutil.cpu_count(logical=True)
+    }
+
+
+def _probe_volatile_info():
+    return {
+        "메모리 크기(GB)": round(psutil.virtual_memory().total / (1024 ** 3), 2)
+    }
+
+
+def get_static_info():
+    global _static_info
+    if _static_info is None:
+        with _static_info_lock:
+            if _static_info is None:
+                _static_info = _probe_static_info()
+    return _static_info
+
+
+def get_volatile_info():
+    global _volatile_info, _volatile_time
+    now = time.monotonic()
+    if _volatile_info is None or now - _volatile_time >= VOLATILE_TTL:
+        _volatile_info = _probe_volatile_info()
+        _volatile_time = now
+    return _volatile_info
+
+
+def invalidate_static_info():
+    # 하드웨어 / OS 변경 후 다시 조회하고 싶을 때 호출
+    global _static_info, _volatile_info
+    with _static_info_lock:
+        _static_info = None
+        _volatile_info = None
+
+
+def benchmark_info(repeat=1000):
+    """매번 조회하는 기존 방식과 캐시 방식의 1회 평균 소요 시간(초)을 비교한다."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        info = _probe_static_info()
+        info.update(_probe_volatile_info())
+    uncached = (time.perf_counter() - start) / repeat
+
+    get_static_info()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        info = dict(get_static_info())
+        info.update(get_volatile_info())
+    cached = (time.perf_counter() - start) / repeat
+    return {"uncached": uncached, "cached": cached}
+
 
 class ExtendedMissionComputer(MissionComputer):
-    def get_mission_computer_info(self):
+    # 위치 인자 순서는 MissionComputer 와 같고, 부하 측정 설정은 키워드로만 받음
+    def __init__(self, source=None, alert_rules=None, output=None, *, load_interval=1.0, load_window=60):
+        super().__init__(source, alert_rules, output)
+        self.load_sampler = LoadSampler(load_interval, load_window)
+
+    def get_mission_computer_info(self, verbose=True):
         try:
-            info = {
-            "운영체계": platform.system(),
-            "운영체계 버전": platform.version(),
-            "CPU 타입": platform.processor(),
-            "CPU 코어수": psutil.cpu_count(logical=True),  
-            "메모리 크기(GB)": round(psutil.virtual_memory().total / (1024 ** 3), 2)
-            }
-            print(json.dumps(info, ensure_ascii=False, indent=4))
+            info = dict(get_static_info())
+            info.update(get_volatile_info())
+            if self.output is not None:
+                self.output.emit("info", info)
+            elif verbose:
+                print(json.dumps(info, ensure_ascii=False, indent=4))
             return info
         except Exception as e:
             return {"error": str(e)}
         
     def get_mission_computer_load(self):
         try:
+            # 백그라운드 측정값을 바로 사용 (아직 없으면 최대 MIN_CPU_INTERVAL 만큼 기다려 한 번 측정)
+            self.load_sampler.start()
+            snapshot = self.load_sampler.latest() or self.load_sampler.sample()
             load = {
-                'CPU 실시간 사용량(%)': psutil.cpu_percent(interval=1),
-                '메모리 실시간 사용량(%)': psutil.virtual_memory().percent
+                'CPU 실시간 사용량(%)': snapshot["cpu"],
+                '메모리 실시간 사용량(%)': snapshot["memory"],
+                '코어별 CPU 사용량(%)': snapshot["per_core"],
+                '디스크 읽기(B/s)': round(snapshot["disk_read"], 1),
+                '디스크 쓰기(B/s)': round(snapshot["disk_write"], 1),
+                'CPU 사용량 백분위(%)': self.load_sampler.window_stats("cpu"),
+                '메모리 사용량 백분위(%)': self.load_sampler.window_stats("memory")
             }
-            print(json.dumps(load, ensure_ascii=False, indent=4))
+            if self.output is not None:
+                self.output.emit("load", load)
+            else:
+                print(json.dumps(load, ensure_ascii=False, indent=4))
             return load
         except Exception as e:
             return {"error": str(e)}
 
 
 # 시스템 정보와 부하 출력
+# (--output ndjson 처럼 출력 계층을 지정하면 압축 JSON 으로 내보냄)
 if __name__ == "__main__":
-    runComputer = ExtendedMissionComputer()
-    print("======== Mission Computer 시스템 정보 ========")
+    output = None
+    if "--output" in sys.argv:
+        specs = sys.argv[sys.argv.index("--output") + 1].split(",")
+        output = TelemetryOutput([make_sink(spec) for spec in specs])
+    runComputer = ExtendedMissionComputer(output=output)
+    if output is None:
+        print("======== Mission Computer 시스템 정보 ========")
     runComputer.get_mission_computer_info()
-    print("\n======== Mission Computer 부하 ========")
-    runComputer.get_mission_computer_load()    
\ No newline at end of file
+    if output is None:
+        print("\n======== Mission Computer 부하 ========")
+    runComputer.get_mission_computer_load()
+    if output is not None:
+        output.close()
+
+    # python mars_mission_computer3.py --bench : 시스템 정보 조회 속도 비교
+    if "--bench" in sys.argv:
+        invalidate_static_info()
+        result = benchmark_info()
+        print("\n======== 시스템 정보 조회 1회 평균 ========")
+        print(f"기존(매번 조회): {result['uncached'] * 1e6:.1f} µs")
+        print(f"캐시 사용: {result['cached'] * 1e6:.1f} µs")    
\ No newline at end of file
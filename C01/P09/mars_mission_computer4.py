@@ -1,71 +1,262 @@
+import heapq
+import itertools
 import threading
 import multiprocessing
 import time
 import random
-import sys
+
+# ----------------------------
+# 힙 기반 스케줄러 (스레드 1개로 여러 주기 작업 실행)
+# ----------------------------
+class Scheduler:
+    def __init__(self):
+        self.tasks = []  # (다음 실행 시각, 순번, 주기, 함수, 소유자)
+        self.counter = itertools.count()
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    def add(self, period, callback, owner=None, delay=0.0):
+        with self.cond:
+            due = time.monotonic() + delay
+            heapq.heappush(self.tasks, (due, next(self.counter), period, callback, owner))
+            self.cond.notify()
+
+    def remove(self, owner):
+        # owner 가 등록한 작업을 모두 즉시 취소
+        with self.cond:
+            self.tasks = [task for task in self.tasks if task[4] is not owner]
+            heapq.heapify(self.tasks)
+            self.cond.notify()
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def join(self):
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running:
+                    if not self.tasks:
+                        self.cond.wait()
+                        continue
+                    wait = self.tasks[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self.cond.wait(wait)  # 새 작업 추가 / 중지 시 바로 깨어남
+                if not self.running:
+                    return
+                due, seq, period, callback, owner = heapq.heappop(self.tasks)
+                # 드리프트 보정: 실행에 걸린 시간과 관계없이 원래 시각 기준으로 다음 실행
+                next_due = due + period
+                now = time.monotonic()
+                if next_due <= now:
+                    # 너무 밀렸으면 놓친 주기는 건너뜀
+                    next_due = now + period - (now - due) % period
+                heapq.heappush(self.tasks, (next_due, seq, period, callback, owner))
+            try:
+                callback()
+            except Exception as e:
+                print(f"❌ 작업 실행 중 오류 발생: {e}")
+
 
 class MissionComputer:
+    # 작업별 실행 주기 (초)
+    INFO_PERIOD = 20
+    LOAD_PERIOD = 20
+    SENSOR_PERIOD = 5
+
     def __init__(self, name):
         self.name = name
         self.running = True
+        self.scheduler = None
+        self.shared = None  # (FleetState, 번호): 다른 프로세스와 공유하는 결과 영역
+
+    # 공유 메모리 결과 영역에 기록 (단독 실행이면 아무것도 안 함)
+    def publish(self, field, value=None):
+        if self.shared is not None:
+            state, index = self.shared
+            state.record(index, field, value)
 
     # 임무 정보 출력 (20초마다)
     def get_mission_computer_info(self):
-        while self.running:
-            print(f"[{self.name}] 🚀 미션 컴퓨터 정보 갱신 중...")
-            time.sleep(20)
+        print(f"[{self.name}] 🚀 미션 컴퓨터 정보 갱신 중...")
+        self.publish("info")
 
     # 시스템 부하 출력 (20초마다)
     def get_mission_computer_load(self):
-        while self.running:
-            load = random.randint(10, 90)
-            print(f"[{self.name}] 💻 현재 시스템 부하: {load}%")
-            time.sleep(20)
+        load = random.randint(10, 90)
+        print(f"[{self.name}] 💻 현재 시스템 부하: {load}%")
+        self.publish("load", load)
 
     # 센서 데이터 출력 (5초마다)
     def get_sensor_data(self):
-        while self.running:
-            sensor_value = random.uniform(0, 100)
-            print(f"[{self.name}] 🌡 센서 데이터: {sensor_value:.2f}")
-            time.sleep(5)
+        sensor_value = random.uniform(0, 100)
+        print(f"[{self.name}] 🌡 센서 데이터: {sensor_value:.2f}")
+        self.publish("sensor", sensor_value)
 
-    # 중간에 멈추기 위한 stop 메소드
+    # 스케줄러에 주기 작업 등록
+    def attach(self, scheduler):
+        self.scheduler = scheduler
+        self.running = True
+        scheduler.add(self.INFO_PERIOD, self.get_mission_computer_info, owner=self)
+        scheduler.add(self.LOAD_PERIOD, self.get_mission_computer_load, owner=self)
+        scheduler.add(self.SENSOR_PERIOD, self.get_sensor_data, owner=self)
+
+    # 중간에 멈추기 위한 stop 메소드 (등록된 작업을 바로 취소)
     def stop(self):
         self.running = False
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+
+# ----------------------------
+# 스케줄러 실행 함수 (스레드 1개로 여러 미션 컴퓨터 실행)
+# ----------------------------
+def run_scheduler(computers):
+    scheduler = Scheduler()
+    for computer in computers:
+        computer.attach(scheduler)
+    scheduler.start()
+    return scheduler
 
 # ----------------------------
-# 멀티스레드 실행 함수
+# 프로세스 간 공유 상태 (공유 메모리)
 # ----------------------------
-def run_threads(computer):
-    threads = []
-    # 스레드 생성
-    threads.append(threading.Thread(target=computer.get_mission_computer_info))
-    threads.append(threading.Thread(target=computer.get_mission_computer_load))
-    threads.append(threading.Thread(target=computer.get_sensor_data))
+# 컴퓨터마다 double 슬롯 하나씩:
+#   [실행 플래그, 정보 횟수, 부하 횟수, 센서 횟수, 마지막 부하, 마지막 센서 값, 마지막 갱신 시각]
+# 부모 프로세스는 실행 플래그를 0 으로 바꿔 자식을 멈추고, 나머지 칸을 읽어 상태를 확인한다.
+class FleetState:
+    FIELDS = ("running", "info_count", "load_count", "sensor_count",
+              "last_load", "last_sensor", "updated_at")
+
+    def __init__(self, size):
+        self.size = size
+        self.data = multiprocessing.RawArray("d", size * len(self.FIELDS))
+        for i in range(size):
+            self._set(i, "running", 1.0)
+
+    def _slot(self, index, field):
+        return index * len(self.FIELDS) + self.FIELDS.index(field)
+
+    def _set(self, index, field, value):
+        self.data[self._slot(index, field)] = value
+
+    def get(self, index, field):
+        return self.data[self._slot(index, field)]
 
-    # 스레드 시작
-    for t in threads:
-        t.start()
+    def record(self, index, field, value=None):
+        # 각 칸은 해당 컴퓨터의 프로세스만 쓰므로 잠금이 필요 없음
+        self.data[self._slot(index, field + "_count")] += 1
+        if value is not None:
+            self._set(index, "last_" + field, value)
+        self._set(index, "updated_at", time.time())
+
+    def is_running(self, index):
+        return self.get(index, "running") != 0
+
+    def request_stop(self, index):
+        self._set(index, "running", 0.0)
+
+    def snapshot(self, index):
+        return {field: self.get(index, field) for field in self.FIELDS}
 
-    return threads
 
 # ----------------------------
 # 멀티프로세스 실행 함수
 # ----------------------------
-def run_process(computer):
-    run_threads(computer)  # 각 프로세스에서 스레드 실행
+STOP_POLL_PERIOD = 0.1  # 자식 프로세스가 실행 플래그를 확인하는 주기 (초)
+
+def run_process(computer, state=None, index=0):
+    computer.shared = (state, index) if state is not None else None
+    scheduler = run_scheduler([computer])  # 각 프로세스에서 스케줄러 실행
+
+    if state is not None:
+        # 부모가 실행 플래그를 내리면 스케줄러를 멈춰 프로세스를 종료
+        def check_stop():
+            if not state.is_running(index):
+                computer.stop()
+                scheduler.stop()
+        scheduler.add(STOP_POLL_PERIOD, check_stop, owner=state)
+
+    scheduler.join()
+
+
+class FleetRunner:
+    """여러 MissionComputer 를 각각의 프로세스로 실행하고, 공유 메모리로 제어/조회한다."""
+
+    def __init__(self, computers):
+        self.computers = computers
+        self.state = FleetState(len(computers))
+        self.processes = []
+
+    def start(self):
+        for index, computer in enumerate(self.computers):
+            p = multiprocessing.Process(target=run_process, args=(computer, self.state, index))
+            self.processes.append(p)
+            p.start()
+
+    def stop(self, timeout=5):
+        for index in range(len(self.computers)):
+            self.state.request_stop(index)
+        for p in self.processes:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+    def join(self):
+        for p in self.processes:
+            p.join()
+
+    def status(self):
+        # 컴퓨터별 현재 상태 (프로세스 재시작 없이 공유 메모리에서 바로 읽음)
+        result = []
+        for index, computer in enumerate(self.computers):
+            snapshot = self.state.snapshot(index)
+            snapshot["name"] = computer.name
+            snapshot["alive"] = self.processes[index].is_alive() if self.processes else False
+            result.append(snapshot)
+        return result
+
+    def summary(self):
+        # 전체 집계: 실행 중인 수, 작업 실행 횟수 합계, 평균 부하
+        status = self.status()
+        loads = [s["last_load"] for s in status if s["load_count"]]
+        return {
+            "alive": sum(1 for s in status if s["alive"]),
+            "info_count": int(sum(s["info_count"] for s in status)),
+            "load_count": int(sum(s["load_count"] for s in status)),
+            "sensor_count": int(sum(s["sensor_count"] for s in status)),
+            "avg_load": round(sum(loads) / len(loads), 2) if loads else None
+        }
 
 # ----------------------------
 # 키 입력 감지 함수
 # ----------------------------
-def monitor_stop_signal(computers):
+def monitor_stop_signal(fleet):
     while True:
-        key = input("🛑 종료하려면 q를 입력하세요: ").strip().lower()
-        if key == "q":
-            for comp in computers:
-                comp.stop()
+        key = input("🛑 종료하려면 q, 상태 확인은 s를 입력하세요: ").strip().lower()
+        if key == "s":
+            for s in fleet.status():
+                print(f"[{s['name']}] 부하 {s['last_load']:.0f}% / 센서 {s['last_sensor']:.2f} "
+                      f"/ 센서 측정 {int(s['sensor_count'])}회")
+            print("📊 전체:", fleet.summary())
+        elif key == "q":
             print("✅ 프로그램을 종료합니다.")
-            sys.exit(0)
+            fleet.stop()
+            return
 
 # ----------------------------
 # 메인 실행 부분
@@ -77,17 +268,13 @@ if __name__ == "__main__":
     runComputer3 = MissionComputer("MissionComputer-3")
 
     # 멀티프로세스로 실행
-    processes = []
-    for comp in [runComputer1, runComputer2, runComputer3]:
-        p = multiprocessing.Process(target=run_process, args=(comp,))
-        processes.append(p)
-        p.start()
+    fleet = FleetRunner([runComputer1, runComputer2, runComputer3])
+    fleet.start()
 
     # 키 입력 감시 스레드 시작 (오타 수정 완료!)
-    monitor_thread = threading.Thread(target=monitor_stop_signal, args=([runComputer1, runComputer2, runComputer3],))
+    monitor_thread = threading.Thread(target=monitor_stop_signal, args=(fleet,))
     monitor_thread.daemon = True
     monitor_thread.start()
 
     # 프로세스 종료 대기
-    for p in processes:
-        p.join()
+    fleet.join()
@@ -0,0 +1,381 @@
+import asyncio
+import base64
+import hashlib
+import struct
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from mars_mission_computer2 import CompactEncoder, DummySensorSource, ReplaySource
+from mars_mission_computer3 import ExtendedMissionComputer
+
+# ----------------------------------------
+# 🛰️ 로컬 텔레메트리 서버 (HTTP / WebSocket)
+# ----------------------------------------
+# MissionComputer 하나가 센서 루프를 돌고, 측정값은 메모리 링 버퍼에 한 번만
+# 압축 JSON 으로 직렬화해 둔다. 여러 대시보드가 접속해도 센서 루프는 하나이고,
+# 응답은 미리 만든 문자열을 이어 붙이기만 한다.
+#
+#   GET /latest                         최신 env_values
+#   GET /info, /load                    시스템 정보 / 부하 스냅샷
+#   GET /history?since=커서&limit=N      커서 이후 기록을 최대 N개씩
+#   GET /history?start=초&end=초         시간 구간 기록 (epoch 초)
+#   GET /ws?since=커서                   WebSocket 으로 새 기록을 묶음 단위로 받음
+#
+# 커서는 기록마다 1씩 늘어나는 번호이다. 응답의 cursor 를 다음 요청의 since 로 넘기면
+# 빠짐없이 이어 받을 수 있고, 링 버퍼에서 이미 밀려난 개수는 missed 로 알려 준다.
+#
+# 브라우저의 다른 사이트가 localhost 서버를 읽지 못하도록, Origin 헤더가 있는 요청
+# (HTTP / WebSocket)은 allowed_origins 에 있는 출처만 받는다. Origin 을 보내지 않는
+# 도구(curl, 스크립트)는 그대로 접속할 수 있다.
+
+HOST = "127.0.0.1"
+PORT = 8765
+HISTORY_SIZE = 3600     # 링 버퍼에 보관할 기록 수
+DEFAULT_LIMIT = 500     # history 한 번에 돌려줄 기본 개수
+MAX_LIMIT = 5000
+REFRESH_INTERVAL = 1.0  # info / load 스냅샷 갱신 주기(초)
+ALLOWED_ORIGINS = ()    # 접속을 허용할 브라우저 출처 (예: "http://localhost:3000")
+MAX_FRAME_SIZE = 4096   # 클라이언트가 보내는 WebSocket 프레임 최대 크기 (ping / close 만 받음)
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+               405: "Method Not Allowed"}
+
+
+class WebSocketError(Exception):
+    """클라이언트 프레임이 규칙에 맞지 않을 때. code 는 close 프레임에 담을 상태 코드."""
+
+    def __init__(self, code, reason):
+        super().__init__(reason)
+        self.code = code
+
+
+class TelemetryHub:
+    """MissionComputer 의 output 자리에 붙여 측정값을 받아 두는 저장소.
+
+    TelemetryOutput 과 같은 emit(kind, data, timestamp) 를 제공하므로
+    MissionComputer(output=hub) 로 연결한다. 센서 / 경보 기록은 링 버퍼에,
+    info / load 는 최신 스냅샷 하나만 보관한다.
+    """
+
+    def __init__(self, capacity=HISTORY_SIZE):
+        self.capacity = capacity
+        self.lines = [None] * capacity       # 직렬화된 기록 (번호 % capacity 위치)
+        self.timestamps = [0.0] * capacity
+        self.next_seq = 1                    # 다음 기록 번호 (커서는 1부터)
+        self.snapshots = {}                  # kind → 직렬화된 최신 스냅샷
+        self.encoder = CompactEncoder()
+        self.lock = threading.Lock()
+        self.loop = None
+        self.changed = None                  # 새 기록이 들어오면 set 되는 asyncio.Event
+
+    def attach(self, loop):
+        self.loop = loop
+        self.changed = asyncio.Event()
+
+    def emit(self, kind, data, timestamp=None):
+        record = {"type": kind, "timestamp": time.time() if timestamp is None else timestamp}
+        record.update(data)
+        line = self.encoder.encode(record)
+        with self.lock:
+            if kind in ("sensor", "alert"):
+                index = self.next_seq % self.capacity
+                self.lines[index] = line
+                self.timestamps[index] = record["timestamp"]
+                self.next_seq += 1
+                if kind == "sensor":
+                    self.snapshots["latest"] = line
+            else:
+                self.snapshots[kind] = line
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        # 기다리던 WebSocket 들을 한 번에 깨우고 다음 대기를 위해 새 Event 로 교체
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def snapshot(self, kind):
+        return self.snapshots.get(kind, "null")
+
+    def since(self, cursor, limit):
+        """cursor 이후 기록을 최대 limit 개 반환: (마지막 번호, 놓친 개수, 직렬화된 기록 목록)."""
+        with self.lock:
+            oldest = max(1, self.next_seq - self.capacity)
+            first = max(cursor + 1, oldest)
+            last = min(self.next_seq, first + limit)
+            lines = [self.lines[seq % self.capacity] for seq in range(first, last)]
+        missed = max(0, oldest - cursor - 1)
+        return max(cursor, last - 1), missed, lines
+
+    def latest(self, limit):
+        with self.lock:
+            oldest = max(1, self.next_seq - self.capacity)
+            cursor = max(oldest - 1, self.next_seq - 1 - limit)
+        return self.since(cursor, limit)
+
+    def window(self, start, end, limit):
+        """start <= timestamp < end 인 기록을 최대 limit 개 반환 (시각은 번호 순으로 증가)."""
+        with self.lock:
+            oldest = max(1, self.next_seq - self.capacity)
+            lo, hi = oldest, self.next_seq
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.timestamps[mid % self.capacity] < start:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            lines = []
+            seq = lo
+            while seq < self.next_seq and len(lines) < limit:
+                index = seq % self.capacity
+                if self.timestamps[index] >= end:
+                    break
+                lines.append(self.lines[index])
+                seq += 1
+        return seq - 1, 0, lines
+
+
+def batch_body(cursor, missed, lines):
+    return '{"cursor":%d,"missed":%d,"records":[%s]}' % (cursor, missed, ",".join(lines))
+
+
+class TelemetryServer:
+    def __init__(self, computer, hub, host=HOST, port=PORT, allowed_origins=ALLOWED_ORIGINS):
+        self.computer = computer
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.allowed_origins = set(allowed_origins)
+        self.server = None
+        self.clients = 0
+
+    # ---------- 스냅샷 갱신 / 센서 루프 ----------
+
+    async def _refresh(self):
+        # 요청마다 계산하지 않고 주기적으로 갱신해 둔 스냅샷만 돌려줌
+        while True:
+            self.computer.get_mission_computer_info(verbose=False)
+            self.computer.get_mission_computer_load()
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    def start_sensor_loop(self):
+        thread = threading.Thread(target=self.computer.get_sensor_data,
+                                  kwargs={"verbose": False}, daemon=True)
+        thread.start()
+        return thread
+
+    # ---------- HTTP ----------
+
+    def _origin_allowed(self, headers):
+        # Origin 이 없으면 브라우저 밖의 도구이므로 허용
+        origin = headers.get("origin")
+        return origin is None or origin in self.allowed_origins
+
+    async def _respond(self, writer, status, body, content_type="application/json", origin=None):
+        data = body.encode("utf-8")
+        # 허용된 출처에만 그 출처 이름으로 CORS 헤더를 붙임
+        cors = f"Access-Control-Allow-Origin: {origin}\r\nVary: Origin\r\n" if origin else ""
+        writer.write((
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Cache-Control: no-store\r\n"
+            f"{cors}"
+            "\r\n"
+        ).encode("ascii") + data)
+        await writer.drain()
+
+    def _route(self, path, query):
+        hub = self.hub
+        if path == "/latest":
+            return 200, hub.snapshot("latest")
+        if path in ("/info", "/load"):
+            return 200, hub.snapshot(path[1:])
+        if path == "/history":
+            limit = max(0, min(int(query.get("limit", DEFAULT_LIMIT)), MAX_LIMIT))
+            if "start" in query or "end" in query:
+                start = float(query.get("start", 0))
+                end = float(query.get("end", "inf"))
+                return 200, batch_body(*hub.window(start, end, limit))
+            if "since" in query:
+                return 200, batch_body(*hub.since(int(query["since"]), limit))
+            return 200, batch_body(*hub.latest(limit))
+        return 404, '{"error":"not found"}'
+
+    async def _handle(self, reader, writer):
+        self.clients += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self._respond(writer, 400, '{"error":"bad request"}')
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                url = urlsplit(target)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                if method != "GET":
+                    await self._respond(writer, 405, '{"error":"method not allowed"}')
+                    return
+                if not self._origin_allowed(headers):
+                    await self._respond(writer, 403, '{"error":"origin not allowed"}')
+                    return
+                if url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, headers, query)
+                    return
+                try:
+                    status, body = self._route(url.path, query)
+                except ValueError:
+                    status, body = 400, '{"error":"bad query"}'
+                await self._respond(writer, status, body, origin=headers.get("origin"))
+                if version == "HTTP/1.0" or headers.get("connection", "").lower() == "close":
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    # ---------- WebSocket ----------
+
+    @staticmethod
+    def _frame(opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        return header + payload
+
+    @staticmethod
+    async def _read_frame(reader, max_size=MAX_FRAME_SIZE):
+        first, second = await reader.readexactly(2)
+        if not second & 0x80:
+            raise WebSocketError(1002, "unmasked frame")  # 클라이언트 프레임은 반드시 마스킹
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if length > max_size:
+            raise WebSocketError(1009, "frame too large")  # 길이만큼 읽기 전에 거절
+        mask = await reader.readexactly(4)
+        payload = await reader.readexactly(length)
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return first & 0x0F, payload
+
+    async def _websocket(self, reader, writer, headers, query):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, 400, '{"error":"missing websocket key"}')
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n"
+            "\r\n"
+        ).encode("ascii"))
+        await writer.drain()
+
+        try:
+            cursor = int(query.get("since", self.hub.latest(0)[0]))
+            limit = max(1, min(int(query.get("limit", DEFAULT_LIMIT)), MAX_LIMIT))
+        except ValueError:
+            cursor, limit = self.hub.latest(0)[0], DEFAULT_LIMIT
+        closed = asyncio.Event()
+
+        async def receive():
+            # 클라이언트가 보내는 ping / close 만 처리
+            try:
+                while True:
+                    opcode, payload = await self._read_frame(reader)
+                    if opcode == 0x8:
+                        writer.write(self._frame(0x8, payload[:2]))
+                        break
+                    if opcode == 0x9:
+                        writer.write(self._frame(0xA, payload))
+            except WebSocketError as e:
+                writer.write(self._frame(0x8, struct.pack("!H", e.code) + str(e).encode("ascii")))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            closed.set()
+
+        receiver = asyncio.ensure_future(receive())
+        try:
+            while not closed.is_set():
+                changed = self.hub.changed
+                new_cursor, missed, lines = self.hub.since(cursor, limit)
+                if lines or missed:
+                    # 쌓인 기록을 프레임 하나로 묶어서 전송
+                    body = batch_body(new_cursor, missed, lines).encode("utf-8")
+                    writer.write(self._frame(0x1, body))
+                    await writer.drain()
+                    cursor = new_cursor
+                    if len(lines) == limit:
+                        continue
+                waiter = asyncio.ensure_future(changed.wait())
+                await asyncio.wait([waiter, receiver], return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+        except ConnectionError:
+            pass
+        finally:
+            receiver.cancel()
+
+    # ---------- 실행 ----------
+
+    async def serve(self):
+        self.hub.attach(asyncio.get_running_loop())
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        refresher = asyncio.ensure_future(self._refresh())
+        print(f"🛰️ 텔레메트리 서버 시작 → http://{self.host}:{self.port}/latest")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            refresher.cancel()
+
+
+def run_server(host=HOST, port=PORT, source=None, history=HISTORY_SIZE, allowed_origins=ALLOWED_ORIGINS):
+    hub = TelemetryHub(history)
+    computer = ExtendedMissionComputer(source=source, output=hub)
+    server = TelemetryServer(computer, hub, host, port, allowed_origins)
+    server.start_sensor_loop()
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("✅ 텔레메트리 서버를 종료합니다.")
+
+
+# python mars_telemetry_server.py [--port N] [--interval 초] [--replay env_log.txt [--speed N]]
+#                                 [--allow-origin http://localhost:3000,...]
+if __name__ == "__main__":
+    def option(name, default=None):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    if "--replay" in sys.argv:
+        speed = option("--speed")
+        source = ReplaySource(option("--replay"), float(speed) if speed else None)
+    else:
+        source = DummySensorSource(interval=float(option("--interval", 5)))
+    origins = option("--allow-origin")
+    run_server(port=int(option("--port", PORT)), source=source,
+               allowed_origins=origins.split(",") if origins else ALLOWED_ORIGINS)
@@ -0,0 +1,442 @@
+import array
+import contextlib
+import datetime
+import gc
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# ----------------------------------------
+# ⏱️ 미션 컴퓨터 텔레메트리 파이프라인 벤치마크
+# ----------------------------------------
+# P06~P09 의 클래스를 sleep 없이 돌려 측정값 하나당 비용을 잰다.
+#   samples_per_s                  초당 처리한 측정값 수
+#   latency_us (p50/p90/p99/max)   측정값 하나를 처리하는 데 걸린 시간
+#   alloc_peak_bytes (p50/p99)     측정값 하나를 처리하는 동안 늘어난 메모리 최고치 (tracemalloc)
+#   retained_blocks_per_sample     처리 후에도 남아 있는 메모리 블록 수 (누수 확인용)
+#   peak_rss_kb                    프로세스 최대 RSS
+#
+# 시나리오마다 새 프로세스에서 실행하므로 폴더별 같은 이름의 모듈이 섞이지 않고
+# peak RSS 도 시나리오별로 따로 잰다. 각 프로세스는 워밍업을 한 번 돌린 뒤 측정하고,
+# 시나리오마다 --repeats 번 (시나리오를 번갈아 가며) 실행해 처리량 / 지연의 중앙값을 기록한다.
+# 결과는 JSON 으로 저장하고, --compare 로 이전 결과와 비교하면 처리량이
+# --threshold 넘게 줄었거나 p99 지연이 --p99-threshold 넘게 늘어난 시나리오를
+# 회귀로 표시한다. p99 는 한 번의 멈춤(GC, 스케줄링)에도 크게 흔들리므로 허용 폭을 넓게 둔다.
+#
+# python bench_mission_computer.py [--samples N] [--repeats 5] [--warmup N]
+#                                  [--only P07:pipeline,...]
+#                                  [--output bench_results.json]
+#                                  [--compare 이전결과.json [--threshold 0.1] [--p99-threshold 1.0]]
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SAMPLES = 20000
+MEMORY_SAMPLES = 2000          # tracemalloc 측정은 느리므로 따로 적게 실행
+WARMUP_SAMPLES = 2000          # 측정 전에 한 번 돌려 import / 캐시 / 파일 생성 비용을 뺌
+DEFAULT_REPEATS = 5            # 시나리오마다 반복 실행 횟수 (중앙값 사용)
+REGRESSION_THRESHOLD = 0.10    # 처리량(중앙값)이 10% 넘게 줄면 회귀로 표시
+P99_THRESHOLD = 1.0            # p99 지연(중앙값)이 2배를 넘으면 회귀로 표시
+
+
+class Probe:
+    """시나리오가 측정값 하나를 처리할 때마다 tick() 을 호출한다.
+
+    memory=False 면 tick 사이 시간(ns)을, True 면 tick 사이 tracemalloc 최고치 증가량을 기록한다.
+    """
+
+    def __init__(self, n, memory=False):
+        self.memory = memory
+        self.values = array.array("q", bytes(8 * (n + 1)))
+        self.count = 0
+        self.base = 0
+
+    def start(self):
+        self.count = 0
+        if self.memory:
+            tracemalloc.reset_peak()
+            self.base = tracemalloc.get_traced_memory()[0]
+        else:
+            self.values[0] = time.perf_counter_ns()
+
+    def tick(self):
+        self.count += 1
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.values[self.count] = peak - self.base
+            tracemalloc.reset_peak()
+            self.base = current
+        else:
+            self.values[self.count] = time.perf_counter_ns()
+
+
+def probed(source, probe):
+    # 소스에서 다음 값을 꺼낼 때마다 (= 앞의 측정값 처리가 끝날 때마다) tick
+    readings = iter(source)
+    yield next(readings)
+    for reading in readings:
+        probe.tick()
+        yield reading
+
+
+class NullOutput:
+    """출력 계층 자리에 붙여 출력 비용을 빼고 잴 때 사용."""
+
+    def emit(self, kind, data, timestamp=None):
+        pass
+
+
+# ----------------------------------------
+# 🧪 시나리오 (폴더:이름 → 함수(tmp, n, probe))
+# ----------------------------------------
+
+def bench_sensor_log(tmp, n, probe):
+    # P06: DummySensor → 버퍼 로그 기록
+    m = importlib.import_module("mars_mission_computer")
+    with m.BufferedLogWriter(os.path.join(tmp, "env_log.txt")) as writer:
+        ds = m.DummySensor(log_writer=writer)
+        probe.start()
+        for _ in range(n):
+            ds.set_env()
+            ds.get_env()
+            probe.tick()
+
+
+def bench_ring_buffer(tmp, n, probe):
+    # P06: DummySensor → 버퍼 로그 + 바이너리 링 버퍼
+    m = importlib.import_module("mars_mission_computer")
+    with m.BufferedLogWriter(os.path.join(tmp, "env_log.txt")) as writer, \
+            m.TelemetryRingBuffer(os.path.join(tmp, "env_telemetry.bin"), capacity=n) as telemetry:
+        ds = m.DummySensor(log_writer=writer, telemetry=telemetry)
+        probe.start()
+        for _ in range(n):
+            ds.set_env()
+            ds.get_env()
+            probe.tick()
+
+
+def _pipeline(tmp, n, probe, output=None):
+    # DummySensor → MissionComputer(롤업, 기본 경보 규칙) [→ 출력 계층]
+    m = importlib.import_module("mars_mission_computer")
+    m2 = importlib.import_module("mars_mission_computer2")
+    with m.BufferedLogWriter(os.path.join(tmp, "env_log.txt")) as writer:
+        source = m2.DummySensorSource(m.DummySensor(log_writer=writer), interval=0)
+        computer = m2.MissionComputer(probed(source, probe), m2.default_alert_rules(), output)
+        probe.start()
+        computer.get_sensor_data(limit=n, verbose=False)
+        if output is not None:
+            output.close()  # 남은 출력까지 처리해야 끝난 것으로 봄
+        probe.tick()
+    return computer
+
+
+def bench_pipeline(tmp, n, probe):
+    _pipeline(tmp, n, probe)
+
+
+def bench_pipeline_output(tmp, n, probe):
+    m2 = importlib.import_module("mars_mission_computer2")
+    output = m2.TelemetryOutput([m2.RotatingFileSink(os.path.join(tmp, "env_telemetry.ndjson"))])
+    _pipeline(tmp, n, probe, output)
+    return {"dropped": output.dropped}
+
+
+def bench_replay(tmp, n, probe):
+    # 기록된 바이너리 텔레메트리 → MissionComputer (최대 속도 재생)
+    m = importlib.import_module("mars_mission_computer")
+    m2 = importlib.import_module("mars_mission_computer2")
+    path = os.path.join(tmp, "replay.bin")
+    with m.TelemetryRingBuffer(path, capacity=n) as telemetry:
+        telemetry.append_batch(m.DummySensor().sample_batch(n, start_time=time.time() - n, rate=1))
+    computer = m2.MissionComputer(probed(m2.ReplaySource(path), probe), m2.default_alert_rules())
+    probe.start()
+    computer.get_sensor_data(limit=n, verbose=False)
+    probe.tick()
+    return {"alerts": computer.alerts.fired}
+
+
+def bench_info_load(tmp, n, probe):
+    # P08: 시스템 정보(캐시) + 부하 스냅샷 조회
+    m3 = importlib.import_module("mars_mission_computer3")
+    computer = m3.ExtendedMissionComputer(output=NullOutput())
+    computer.get_mission_computer_load()  # 부하 측정 스레드 시작
+    probe.start()
+    for _ in range(n):
+        computer.get_mission_computer_info(verbose=False)
+        computer.get_mission_computer_load()
+        probe.tick()
+    computer.load_sampler.stop()
+
+
+def bench_fleet_tick(tmp, n, probe):
+    # P09: 스케줄러가 부르는 작업 3개를 공유 메모리 기록과 함께 바로 호출 (콘솔 출력은 버림)
+    m4 = importlib.import_module("mars_mission_computer4")
+    computer = m4.MissionComputer("bench")
+    computer.shared = (m4.FleetState(1), 0)
+    probe.start()
+    for _ in range(n):
+        computer.get_mission_computer_info()
+        computer.get_mission_computer_load()
+        computer.get_sensor_data()
+        probe.tick()
+
+
+def bench_telemetry_hub(tmp, n, probe):
+    # P09: DummySensor → ExtendedMissionComputer → 텔레메트리 서버 링 버퍼
+    m = importlib.import_module("mars_mission_computer")
+    m2 = importlib.import_module("mars_mission_computer2")
+    m3 = importlib.import_module("mars_mission_computer3")
+    server = importlib.import_module("mars_telemetry_server")
+    with m.BufferedLogWriter(os.path.join(tmp, "env_log.txt")) as writer:
+        source = m2.DummySensorSource(m.DummySensor(log_writer=writer), interval=0)
+        computer = m3.ExtendedMissionComputer(source=probed(source, probe), output=server.TelemetryHub())
+        probe.start()
+        computer.get_sensor_data(limit=n, verbose=False)
+        probe.tick()
+
+
+SCENARIOS = {
+    "P06:sensor_log": bench_sensor_log,
+    "P06:ring_buffer": bench_ring_buffer,
+    "P07:pipeline": bench_pipeline,
+    "P07:pipeline_output": bench_pipeline_output,
+    "P07:replay": bench_replay,
+    "P08:info_load": bench_info_load,
+    "P09:fleet_tick": bench_fleet_tick,
+    "P09:telemetry_hub": bench_telemetry_hub,
+}
+
+
+# ----------------------------------------
+# 📏 측정 (자식 프로세스)
+# ----------------------------------------
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        import psutil  # Windows
+        return psutil.Process().memory_info().peak_wset // 1024
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_scenario(name, samples, memory_samples, warmup=WARMUP_SAMPLES):
+    folder, _ = name.split(":")
+    sys.path.insert(0, os.path.join(BASE_DIR, folder))
+    bench = SCENARIOS[name]
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            # 0) 워밍업 (import / 캐시 / 파일 생성 비용을 빼기 위해 먼저 돌리고 결과는 버림)
+            if warmup:
+                os.mkdir(os.path.join(tmp, "warmup"))
+                bench(os.path.join(tmp, "warmup"), warmup, Probe(warmup))
+
+            # 1) 처리량 / 지연
+            probe = Probe(samples)
+            gc.collect()
+            blocks = sys.getallocatedblocks()
+            os.mkdir(os.path.join(tmp, "speed"))
+            extra = bench(os.path.join(tmp, "speed"), samples, probe)
+            gc.collect()
+            retained = sys.getallocatedblocks() - blocks
+            rss = peak_rss_kb()
+
+            # 2) 메모리 (tracemalloc 은 느려서 적은 개수로 따로 실행, 0 이면 생략)
+            memory = Probe(memory_samples, memory=True)
+            if memory_samples:
+                os.mkdir(os.path.join(tmp, "memory"))
+                tracemalloc.start()
+                try:
+                    bench(os.path.join(tmp, "memory"), memory_samples, memory)
+                finally:
+                    tracemalloc.stop()
+
+    times = probe.values[:probe.count + 1]
+    latencies = sorted((b - a) / 1000 for a, b in zip(times, times[1:]))
+    elapsed = (times[-1] - times[0]) / 1e9
+    peaks = sorted(memory.values[1:memory.count + 1])
+    result = {
+        "scenario": name,
+        "samples": samples,
+        "elapsed_s": round(elapsed, 6),
+        "samples_per_s": round(samples / elapsed, 1) if elapsed else None,
+        "latency_us": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p90": round(percentile(latencies, 90), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "alloc_peak_bytes": {"p50": percentile(peaks, 50), "p99": percentile(peaks, 99)},
+        "retained_blocks_per_sample": round(retained / samples, 4),
+        "peak_rss_kb": rss,
+    }
+    if extra:
+        result["extra"] = extra
+    return result
+
+
+def summarize(runs):
+    """같은 시나리오를 여러 번 실행한 결과를 하나로 합친다.
+
+    처리량 / 지연 / 남은 블록은 중앙값, max 와 RSS 는 최댓값, 메모리는 첫 실행 값을 쓴다.
+    """
+    first = runs[0]
+    speeds = [run["samples_per_s"] for run in runs if run["samples_per_s"]]
+    latency = {key: round(median([run["latency_us"][key] for run in runs]), 2)
+               for key in ("p50", "p90", "p99")}
+    latency["max"] = max(run["latency_us"]["max"] for run in runs)
+    result = {
+        "scenario": first["scenario"],
+        "samples": first["samples"],
+        "repeats": len(runs),
+        "elapsed_s": round(median([run["elapsed_s"] for run in runs]), 6),
+        "samples_per_s": round(median(speeds), 1) if speeds else None,
+        "samples_per_s_best": max(speeds) if speeds else None,
+        "samples_per_s_runs": speeds,
+        "latency_us": latency,
+        "alloc_peak_bytes": first["alloc_peak_bytes"],
+        "retained_blocks_per_sample": median([run["retained_blocks_per_sample"] for run in runs]),
+        "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+    }
+    if "extra" in runs[-1]:
+        result["extra"] = runs[-1]["extra"]
+    return result
+
+
+# ----------------------------------------
+# 📊 실행 / 저장 / 비교 (부모 프로세스)
+# ----------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(names, samples=DEFAULT_SAMPLES, memory_samples=MEMORY_SAMPLES,
+            repeats=DEFAULT_REPEATS, warmup=WARMUP_SAMPLES):
+    # 반복마다 새 프로세스로 실행하고 시나리오를 번갈아 돌린다.
+    # 잠깐 느려진 구간(다른 프로세스, CPU 클럭 변화)이 한 시나리오의 반복 전체에 몰리지 않게 하기 위함.
+    runs = {name: [] for name in names}
+    errors = {}
+    for repeat in range(repeats):
+        for name in names:
+            if name in errors:
+                continue
+            command = [sys.executable, os.path.abspath(__file__), "--child", name,
+                       "--samples", str(samples), "--warmup", str(warmup),
+                       "--memory-samples", str(memory_samples if repeat == 0 else 0)]
+            proc = subprocess.run(command, capture_output=True, text=True, encoding="utf-8")
+            if proc.returncode != 0:
+                print(f"❌ {name} 실행 중 오류 발생:\n{proc.stderr.strip()}")
+                errors[name] = proc.stderr.strip().splitlines()[-1:]
+                continue
+            runs[name].append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    results = []
+    for name in names:
+        if name in errors:
+            results.append({"scenario": name, "error": errors[name]})
+            continue
+        result = summarize(runs[name])
+        results.append(result)
+        latency = result["latency_us"]
+        print(f"{name:<22} {result['samples_per_s']:>12,.0f}/s (best {result['samples_per_s_best']:>10,.0f})  "
+              f"p50 {latency['p50']:>8.2f}µs  p99 {latency['p99']:>8.2f}µs  "
+              f"alloc {result['alloc_peak_bytes']['p50']:>6}B  rss {result['peak_rss_kb']:>7}KB")
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "samples": samples,
+            "memory_samples": memory_samples,
+            "repeats": repeats,
+            "warmup_samples": warmup,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold=REGRESSION_THRESHOLD, p99_threshold=P99_THRESHOLD):
+    """이전 결과와 비교해 처리량이 threshold 넘게 줄거나 p99 지연이 p99_threshold 넘게
+    늘어난 시나리오 목록을 반환한다."""
+    old = {r["scenario"]: r for r in baseline["results"] if "error" not in r}
+    regressions = []
+    print(f"\n▶ {baseline['meta'].get('commit')} 대비 비교")
+    for result in report["results"]:
+        before = old.get(result["scenario"])
+        if before is None or "error" in result:
+            continue
+        speed = result["samples_per_s"] / before["samples_per_s"]
+        p99 = result["latency_us"]["p99"] / before["latency_us"]["p99"]
+        slower = speed < 1 - threshold
+        laggier = p99 > 1 + p99_threshold
+        if slower or laggier:
+            regressions.append(result["scenario"])
+        reasons = [label for label, bad in (("처리량", slower), ("p99", laggier)) if bad]
+        mark = f"⚠️ 회귀 ({', '.join(reasons)})" if reasons else "✅"
+        print(f"{result['scenario']:<22} 처리량 x{speed:.2f}  p99 x{p99:.2f}  {mark}")
+    return regressions
+
+
+if __name__ == "__main__":
+    def option(name, default=None):
+        if name in sys.argv:
+            return sys.argv[sys.argv.index(name) + 1]
+        return default
+
+    samples = int(option("--samples", DEFAULT_SAMPLES))
+    memory_samples = int(option("--memory-samples", min(samples, MEMORY_SAMPLES)))
+    repeats = max(1, int(option("--repeats", DEFAULT_REPEATS)))
+    warmup = int(option("--warmup", min(samples, WARMUP_SAMPLES)))
+
+    if "--child" in sys.argv:
+        print(json.dumps(run_scenario(option("--child"), samples, memory_samples, warmup), ensure_ascii=False))
+        sys.exit(0)
+
+    names = option("--only")
+    names = names.split(",") if names else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"❌ 알 수 없는 시나리오: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+        sys.exit(2)
+
+    report = run_all(names, samples, memory_samples, repeats, warmup)
+    output_path = option("--output", "bench_results.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장 완료 → {output_path}")
+
+    baseline_path = option("--compare")
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            threshold = float(option("--threshold", REGRESSION_THRESHOLD))
+            p99_threshold = float(option("--p99-threshold", P99_THRESHOLD))
+            regressions = compare(report, json.load(f), threshold, p99_threshold)
+        sys.exit(1 if regressions else 0)